@@ -8,6 +8,10 @@
 #              Don't modify the contents of this file.
 
 
+import struct
+from array import array
+from operator import itemgetter
+
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
 class DynamicArrayException(Exception):
@@ -18,35 +22,45 @@ class DynamicArray:
     """
     Class implementing a Dynamic Array
     Supported methods are:
-    append, pop, swap, get_at_index, set_at_index, length
+    append, extend, pop, swap, get_at_index, set_at_index, length
+    Also supports iteration and slicing with [] syntax.
     """
 
-    def __init__(self, arr=None) -> None:
-        """Initialize new dynamic array using a list."""
-        self._data = arr.copy() if arr else []
+    __slots__ = ('_data', '_typecode')
 
-    def __iter__(self):
+    def __init__(self, arr=None, length: int = 0, fill: object = None,
+                 typecode: str = None) -> None:
         """
-        Disable iterator capability for DynamicArray class
-        This means loops and aggregate functions like
-        those shown below won't work:
-
-        da = DynamicArray()
-        for value in da:        # will not work
-        min(da)                 # will not work
-        max(da)                 # will not work
-        sort(da)                # will not work
+        Initialize new dynamic array using a list, or with the given length
+        where every element is fill. With a typecode (see the array module)
+        the elements are stored unboxed in an array.array, for numeric contents.
         """
-        return None
+        self._typecode = typecode
+        if typecode is None:
+            self._data = arr.copy() if arr else [fill] * length
+        elif arr:
+            self._data = array(typecode, arr)
+        else:
+            self._data = array(typecode, [0 if fill is None else fill]) * length
+
+    def __iter__(self):
+        """Return an iterator over the elements of the array."""
+        return iter(self._data)
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
+        if self._typecode is not None:
+            return str(self._data.tolist())
         return str(self._data)
 
     def append(self, value: object) -> None:
         """Add new element at the end of the array."""
         self._data.append(value)
 
+    def extend(self, values) -> None:
+        """Add every element of a DynamicArray or other iterable at the end of the array."""
+        self._data.extend(values._data if isinstance(values, DynamicArray) else values)
+
     def pop(self):
         """Remove element from end of the array and return it."""
         return self._data.pop()
@@ -57,29 +71,54 @@ class DynamicArray:
 
     def get_at_index(self, index: int):
         """Return value of element at a given index."""
-        if index < 0 or index >= self.length():
+        if index < 0 or index >= len(self._data):
             raise DynamicArrayException
         return self._data[index]
 
-    def __getitem__(self, index: int):
-        """Return value of element at a given index using [] syntax."""
+    def __getitem__(self, index):
+        """
+        Return value of element at a given index using [] syntax,
+        or a new DynamicArray with the elements of a slice.
+        """
+        if isinstance(index, slice):
+            return DynamicArray(self._data[index], typecode=self._typecode)
         return self.get_at_index(index)
 
     def set_at_index(self, index: int, value: object) -> None:
         """Set value of element at a given index."""
-        if index < 0 or index >= self.length():
+        if index < 0 or index >= len(self._data):
             raise DynamicArrayException
         self._data[index] = value
 
-    def __setitem__(self, index: int, value: object) -> None:
-        """Set value of element at a given index using [] syntax."""
-        self.set_at_index(index, value)
+    def __setitem__(self, index, value: object) -> None:
+        """
+        Set value of element at a given index using [] syntax,
+        or replace a slice with the elements of a DynamicArray or other iterable.
+        """
+        if isinstance(index, slice):
+            values = value._data if isinstance(value, DynamicArray) else value
+            if self._typecode is not None and not isinstance(values, array):
+                values = array(self._typecode, values)
+            self._data[index] = values
+        else:
+            self.set_at_index(index, value)
 
     def length(self) -> int:
         """Return length of array."""
         return len(self._data)
 
 
+def to_list(items) -> list:
+    """
+    Return the items of a DynamicArray, NumPy array or any other iterable
+    as a list. NumPy arrays are converted with tolist() so their elements
+    become plain Python scalars that hash the same as ordinary keys.
+    """
+    if hasattr(items, 'tolist'):
+        return items.tolist()
+    return list(items)
+
+
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
     hash = 0
@@ -98,6 +137,183 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+def mix_hash(hash_code: int, seed: int = 0) -> int:
+    """
+    Scramble a hash code (combined with an optional seed) into 64 bits using
+    the MurmurHash3 finalizer, so every output bit depends on every input bit.
+    Different seeds give independent-looking hash functions from one hash code.
+    """
+    hash_code = (hash_code ^ seed) & 0xFFFFFFFFFFFFFFFF
+    hash_code ^= hash_code >> 33
+    hash_code = (hash_code * 0xFF51AFD7ED558CCD) & 0xFFFFFFFFFFFFFFFF
+    hash_code ^= hash_code >> 33
+    hash_code = (hash_code * 0xC4CEB9FE1A85EC53) & 0xFFFFFFFFFFFFFFFF
+    hash_code ^= hash_code >> 33
+    return hash_code
+
+
+def mix_hash_array(hash_codes, seeds=None):
+    """
+    Vectorized mix_hash over a NumPy array of uint64 hash codes, giving the same
+    results. seeds, if given, is a uint64 array combined with the hash codes
+    using NumPy broadcasting, so one row per seed can be mixed at once.
+    """
+    uint64 = hash_codes.dtype.type
+    shift = uint64(33)
+    if seeds is not None:
+        hash_codes = hash_codes ^ seeds
+    hash_codes = hash_codes ^ (hash_codes >> shift)
+    hash_codes = hash_codes * uint64(0xFF51AFD7ED558CCD)
+    hash_codes = hash_codes ^ (hash_codes >> shift)
+    hash_codes = hash_codes * uint64(0xC4CEB9FE1A85EC53)
+    return hash_codes ^ (hash_codes >> shift)
+
+
+def key_to_bytes(key: object) -> bytes:
+    """
+    Encode a key as bytes for the byte-oriented hash functions below.
+    The first byte tags the key's type, so keys of different types, such as
+    'a', b'a' and 97, or None and 'None', get different bytes. Strings are
+    UTF-8 encoded, integers (and floats with an integral value, which compare
+    equal to them) become their signed little-endian bytes, tuples encode
+    each item with a length prefix, and anything else falls back to its repr().
+    """
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return b'b' + bytes(key)
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if isinstance(key, int):
+        return b'i' + key.to_bytes((key.bit_length() + 8) // 8, 'little', signed=True)
+    if isinstance(key, float):
+        return b'f' + struct.pack('<d', key)
+    if isinstance(key, tuple):
+        parts = [key_to_bytes(item) for item in key]
+        return b't' + b''.join(struct.pack('<I', len(part)) + part for part in parts)
+    return b'r' + repr(key).encode('utf-8', 'surrogatepass')
+
+
+def _fnv1a(data: bytes, seed: int = 0) -> int:
+    """64-bit FNV-1a of the given bytes, with the seed xored into the offset basis."""
+    hash = (0xCBF29CE484222325 ^ seed) & 0xFFFFFFFFFFFFFFFF
+    for byte in data:
+        hash = ((hash ^ byte) * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+    return hash
+
+
+def hash_function_fnv1a(key: object, seed: int = 0) -> int:
+    """
+    64-bit FNV-1a hash of the key's bytes; the seed perturbs the offset basis.
+    Unlike hash_function_1, character order matters, so anagrams don't collide.
+    """
+    return _fnv1a(key_to_bytes(key), seed)
+
+
+def _sip_round(v0: int, v1: int, v2: int, v3: int) -> tuple:
+    """One SipRound over the four 64-bit state words."""
+    mask = 0xFFFFFFFFFFFFFFFF
+    v0 = (v0 + v1) & mask
+    v1 = ((v1 << 13) | (v1 >> 51)) & mask
+    v1 ^= v0
+    v0 = ((v0 << 32) | (v0 >> 32)) & mask
+    v2 = (v2 + v3) & mask
+    v3 = ((v3 << 16) | (v3 >> 48)) & mask
+    v3 ^= v2
+    v0 = (v0 + v3) & mask
+    v3 = ((v3 << 21) | (v3 >> 43)) & mask
+    v3 ^= v0
+    v2 = (v2 + v1) & mask
+    v1 = ((v1 << 17) | (v1 >> 47)) & mask
+    v1 ^= v2
+    v2 = ((v2 << 32) | (v2 >> 32)) & mask
+    return v0, v1, v2, v3
+
+
+def _siphash(data: bytes, seed: int = 0) -> int:
+    """SipHash-2-4 of the given bytes, keyed with the low 128 bits of the seed."""
+    k0 = seed & 0xFFFFFFFFFFFFFFFF
+    k1 = (seed >> 64) & 0xFFFFFFFFFFFFFFFF
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    tail = len(data) - len(data) % 8
+    for i in range(0, tail, 8):
+        m = int.from_bytes(data[i:i + 8], 'little')
+        v3 ^= m
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0 ^= m
+
+    m = ((len(data) & 0xFF) << 56) | int.from_bytes(data[tail:], 'little')
+    v3 ^= m
+    v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    v0 ^= m
+
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def hash_function_siphash(key: object, seed: int = 0) -> int:
+    """
+    SipHash-2-4 of the key's bytes, keyed with the low 128 bits of the seed.
+    A keyed hash: without the seed, an attacker can't craft colliding keys.
+    """
+    return _siphash(key_to_bytes(key), seed)
+
+
+def hash_function_builtin(key: object, seed: int = 0) -> int:
+    """
+    The interpreter's own hash() of the key, mixed with the seed by mix_hash.
+    By far the fastest option and works for any hashable key, but str and bytes
+    hashes change between processes unless PYTHONHASHSEED is fixed.
+    """
+    return mix_hash(hash(key), seed)
+
+
+class HashMapView:
+    """
+    Lazy view of the keys, values or (key, value) pairs of a hash map, like the
+    views returned by dict.keys(), values() and items(). Nothing is copied: each
+    iteration streams over the map's buckets (through its _iter_items()), so the
+    view always shows the map's current contents. As with a dict, the map must
+    not be changed while one of its views is being iterated.
+    """
+
+    __slots__ = ('_hash_map', '_field')
+
+    def __init__(self, hash_map, field: int = None) -> None:
+        """Initialize a view of the keys (field 0), values (field 1) or items (None)."""
+        self._hash_map = hash_map
+        self._field = field
+
+    def __len__(self) -> int:
+        """Return the number of entries in the hash map."""
+        return self._hash_map.get_size()
+
+    def __iter__(self):
+        """Return a new, independent iterator over the view."""
+        items = self._hash_map._iter_items()
+        if self._field is None:
+            return items
+        return map(itemgetter(self._field), items)
+
+    def __contains__(self, item: object) -> bool:
+        """Keys are looked up in the hash map, values and items are searched for."""
+        if self._field == 0:
+            return self._hash_map.contains_key(item)
+        return any(element == item for element in self)
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(list(self))
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -105,11 +321,15 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """Initialize node given a key, value and (optionally) the key's hash."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -121,6 +341,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -146,6 +368,8 @@ class LinkedList:
     Supported methods are: insert, remove, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -170,20 +394,22 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Insert new node at front of the list, caching the key's hash."""
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If hash is given, nodes with a different cached hash are skipped
+        without comparing keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -194,11 +420,15 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If hash is given, nodes with a different cached hash are skipped
+        without comparing keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -210,15 +440,40 @@ class LinkedList:
 
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
+# stored in place of a tombstone's hash; compares unequal to every hash code
+_TOMBSTONE_HASH = object()
+
+
 class HashEntry:
+    """
+    Hash map entry. A tombstone is marked by replacing its cached hash
+    with a sentinel, so entries need no separate field for the flag and
+    a probe that matches the hash has found a live entry.
+    """
+
+    __slots__ = ('key', 'value', 'hash')
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry for use in a hash map, caching the key's hash."""
         self.key = key
         self.value = value
+        self.hash = hash
 
-        # Set this value to True when you "delete" a HashEntry
-        self.is_tombstone = False
+    @property
+    def is_tombstone(self) -> bool:
+        """True once the entry has been "deleted"."""
+        return self.hash is _TOMBSTONE_HASH
+
+    @is_tombstone.setter
+    def is_tombstone(self, value: bool) -> None:
+        """
+        Set this value to True when you "delete" a HashEntry.
+        The cached hash is dropped, so it can't be set back to False.
+        """
+        if value:
+            self.hash = _TOMBSTONE_HASH
+        elif self.hash is _TOMBSTONE_HASH:
+            raise ValueError("a tombstone can't be revived")
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -0,0 +1,125 @@
+# Description: Capacity policies for the hash maps. PrimeCapacity keeps the prime table
+#              sizes the maps have always used, but looks primes up in a table built
+#              once by a sieve instead of trial-dividing upward on every resize.
+#              PowerOfTwoCapacity sizes tables to powers of two so a bucket index is
+#              just the low bits of the hash; since weak hash functions vary little in
+#              their low bits, its hash function is finalized with mix_hash first.
+
+from array import array
+from bisect import bisect_left
+from functools import partial
+from itertools import compress
+from math import isqrt
+
+from a6_include import mix_hash
+
+_SIEVE_LIMIT = 1 << 16  # primes below this are looked up, above it they are tested
+
+
+def _sieve(limit: int) -> array:
+    """
+    Returns every prime below the given limit, in ascending order.
+    """
+    sieve = bytearray([1]) * limit
+    sieve[0] = sieve[1] = 0
+    for factor in range(2, isqrt(limit - 1) + 1):
+        if sieve[factor]:
+            sieve[factor * factor::factor] = bytes(len(range(factor * factor, limit, factor)))
+    return array('L', compress(range(limit), sieve))
+
+
+_PRIMES = _sieve(_SIEVE_LIMIT)
+
+
+def is_prime(number: int) -> bool:
+    """
+    Returns True if the given integer is a prime number. Numbers below the
+    sieve limit are looked up in the prime table; larger ones are only
+    trial-divided by the primes in it, not by every odd number.
+    """
+    if number < _SIEVE_LIMIT:
+        idx = bisect_left(_PRIMES, number)
+        return idx < len(_PRIMES) and _PRIMES[idx] == number
+
+    root = isqrt(number)
+    for factor in _PRIMES:
+        if factor > root:
+            return True
+        if number % factor == 0:
+            return False
+
+    # only reached for numbers of 2 ** 32 and up
+    return all(number % factor for factor in range(_SIEVE_LIMIT + 1, root + 1, 2))
+
+
+def next_prime(number: int) -> int:
+    """
+    Returns the smallest prime number greater than or equal to the given integer.
+    """
+    idx = bisect_left(_PRIMES, number)
+    if idx < len(_PRIMES):
+        return _PRIMES[idx]
+
+    number = max(number, _SIEVE_LIMIT) | 1  # 2 is the only even prime
+    while not is_prime(number):
+        number += 2
+    return number
+
+
+class PrimeCapacity:
+    """
+    Prime table sizes, indexed with hash % capacity. Gives the same
+    capacities as the maps' resize_table() got from _is_prime() /
+    _next_prime(): a prime is kept as is. The one difference is a map
+    created with capacity 2, which __init__'s _next_prime() made 3.
+    """
+
+    power_of_two = False
+
+    @staticmethod
+    def round_up(capacity: int) -> int:
+        """
+        Returns the smallest prime capacity of at least the given size
+        (3 for anything smaller than 2; 2 itself is kept).
+        """
+        return next_prime(capacity) if capacity >= 2 else 3
+
+    @staticmethod
+    def hash_function(function):
+        """
+        Returns the hash function the map should use: a prime modulus
+        spreads any hash, so the given one is used as is.
+        """
+        return function
+
+
+def _finalized(function, key) -> int:
+    """
+    Returns the key's hash under the given function, finalized with mix_hash.
+    """
+    return mix_hash(function(key))
+
+
+class PowerOfTwoCapacity:
+    """
+    Power-of-two table sizes, indexed with hash & (capacity - 1).
+    Hashes are finalized with mix_hash, which makes them non-negative and
+    spreads every input bit into the low bits the mask keeps.
+    """
+
+    power_of_two = True
+
+    @staticmethod
+    def round_up(capacity: int) -> int:
+        """
+        Returns the smallest power of two of at least the given size.
+        """
+        return 1 << (max(capacity, 1) - 1).bit_length()
+
+    @staticmethod
+    def hash_function(function):
+        """
+        Returns the given hash function followed by the mix_hash finalizer
+        (a partial rather than a closure, so it can be pickled).
+        """
+        return partial(_finalized, function)
@@ -0,0 +1,123 @@
+# Description: Multi-threaded stress benchmark for ConcurrentHashMap. For each thread
+#              count, every thread runs the same number of operations (a mix of get()
+#              and increment() on a shared key set) against the striped map and
+#              against an SC HashMap behind a single lock, and the throughput of each
+#              is reported. Afterwards the counts are checked: a lost update makes it
+#              exit with status 1. On free-threaded builds, threads can run in parallel.
+#
+# Usage:       python concurrency_benchmark.py [--threads N [N ...]] [--ops N]
+#                                              [--keys N] [--writes F] [--stripes N]
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from a6_include import hash_function_builtin
+from hash_map_concurrent import ConcurrentHashMap
+from hash_map_sc import HashMap
+
+
+class LockedHashMap:
+    """
+    SC HashMap with one lock around every operation: the baseline that
+    lock striping is measured against.
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        """Initialize the map and its lock."""
+        self._map = HashMap(capacity, function)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> object:
+        """Return the value associated with the given key."""
+        with self._lock:
+            return self._map.get(key)
+
+    def increment(self, key: str, delta: int = 1) -> object:
+        """Add delta to the value associated with the given key."""
+        with self._lock:
+            return self._map.increment(key, delta)
+
+    def get_keys_and_values(self):
+        """Return the key/value pairs in the map."""
+        with self._lock:
+            return self._map.get_keys_and_values()
+
+
+def run(factory, threads: int, ops: int, keys: list, writes: float) -> dict:
+    """
+    Runs `ops` operations in each of the given number of threads against a new
+    map, and returns the throughput and whether every increment was counted.
+    """
+    hash_map = factory()
+    for key in keys:
+        hash_map.increment(key, 0)
+
+    # operations are drawn up front so the timed loop only touches the map
+    rng = random.Random(threads)
+    plans = [[(rng.random() < writes, rng.choice(keys)) for _ in range(ops)]
+             for _ in range(threads)]
+    increments = sum(is_write for plan in plans for is_write, _ in plan)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(plan: list) -> None:
+        get, increment = hash_map.get, hash_map.increment
+        barrier.wait()
+        for is_write, key in plan:
+            if is_write:
+                increment(key)
+            else:
+                get(key)
+
+    workers = [threading.Thread(target=worker, args=(plan,)) for plan in plans]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    counted = sum(value for _, value in hash_map.get_keys_and_values())
+    return {'ops_per_second': threads * ops / elapsed, 'consistent': counted == increments}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure map throughput as the number of threads grows.")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="thread counts to measure (default: 1 2 4 8)")
+    parser.add_argument('--ops', type=int, default=100000,
+                        help="operations per thread (default: 100000)")
+    parser.add_argument('--keys', type=int, default=10000,
+                        help="number of distinct keys (default: 10000)")
+    parser.add_argument('--writes', type=float, default=0.2,
+                        help="fraction of operations that are increments (default: 0.2)")
+    parser.add_argument('--stripes', type=int, default=16,
+                        help="stripe locks in the concurrent map (default: 16)")
+    args = parser.parse_args()
+
+    keys = [f"key{i}" for i in range(args.keys)]
+    maps = {
+        'striped': lambda: ConcurrentHashMap(args.keys, hash_function_builtin, args.stripes),
+        'one-lock': lambda: LockedHashMap(args.keys, hash_function_builtin),
+    }
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"GIL {'enabled' if gil else 'disabled'}, {args.writes:.0%} writes")
+    print(f"{'map':<10}{'threads':>8}{'ops/s':>14}")
+    consistent = True
+    for name, factory in maps.items():
+        for threads in args.threads:
+            result = run(factory, threads, args.ops, keys, args.writes)
+            consistent = consistent and result['consistent']
+            note = '' if result['consistent'] else '  LOST UPDATES'
+            print(f"{name:<10}{threads:>8}{result['ops_per_second']:>14,.0f}{note}")
+
+    if not consistent:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# Description: Hash function quality analyzer. Hashes a key corpus with one of the
+#              project's hash functions and reports how the keys would spread over a
+#              table of the given capacity: bucket occupancy, SC chain lengths, OA
+#              quadratic probe counts, full-hash collisions and avalanche behaviour.
+#
+# Usage:       python hash_analyzer.py KEYS_FILE CAPACITY [--function NAME] [--sample N]
+#              (one key per line; NAME is any hash function in a6_include)
+
+import argparse
+
+import numpy as np
+
+import a6_include
+
+_HASH_MASK = (1 << 64) - 1
+_MAX_PROBES = 1 << 16  # probe rounds simulated before the OA report is cut short
+
+
+def hash_keys(function, keys) -> np.ndarray:
+    """
+    Hashes every key once and returns the hashes, reduced to 64 bits,
+    as a uint64 array.
+    """
+    return np.fromiter((function(key) & _HASH_MASK for key in keys), dtype=np.uint64)
+
+
+def bucket_stats(hashes: np.ndarray, capacity: int) -> dict:
+    """
+    Occupancy of a table with the given number of buckets: histogram of
+    chain lengths, SC chain statistics and a chi-squared test against a
+    uniform spread of the same number of keys.
+    """
+    n = hashes.size
+    counts = np.bincount((hashes % np.uint64(capacity)).astype(np.int64), minlength=capacity)
+    histogram = np.bincount(counts)
+    non_empty = int(np.count_nonzero(counts))
+    load = n / capacity
+
+    return {
+        'load_factor': load,
+        'empty_buckets': capacity - non_empty,
+        'expected_empty_buckets': capacity * (1 - 1 / capacity) ** n,
+        'occupancy_histogram': {length: int(buckets) for length, buckets
+                                in enumerate(histogram.tolist()) if buckets},
+        'bucket_collisions': n - non_empty,
+        'sc_max_chain': int(counts.max()) if n else 0,
+        'sc_mean_chain': n / non_empty if non_empty else 0.0,
+        # a successful search for the i-th key of a chain walks i nodes
+        'sc_mean_probes': float((counts * (counts + 1) // 2).sum()) / n if n else 0.0,
+        'chi_squared': float(((counts - load) ** 2).sum() / load) if n else 0.0,
+        'chi_squared_expected': capacity - 1,
+    }
+
+
+def quadratic_probe_stats(hashes: np.ndarray, capacity: int, max_probes: int = _MAX_PROBES) -> dict:
+    """
+    Simulates placing every key in an open addressing table of the given capacity
+    with quadratic probing, as hash_map_oa.HashMap does. All unplaced keys take
+    their next probe together each round and one of those reaching a free slot
+    gets it, which matches some sequential insertion order. Keys with the same
+    home bucket follow the same probe sequence, so they are simulated as one
+    group with a count, and a round costs time per pending home, not per key.
+    Returns the mean and max number of probes needed to place (and later find)
+    a key, and how many keys found no slot. The simulation is skipped (None)
+    when there are at least as many keys as buckets, and stops once no bucket
+    is free or after max_probes rounds, when oa_truncated is True and the keys
+    still unplaced might have found a slot further on.
+    """
+    n = hashes.size
+    if n >= capacity:
+        return {'oa_mean_probes': None, 'oa_max_probes': None,
+                'oa_unplaced': None, 'oa_truncated': False}
+
+    homes, pending = np.unique((hashes % np.uint64(capacity)).astype(np.int64), return_counts=True)
+    occupied = np.zeros(capacity, dtype=bool)
+    total_probes = max_seen = placed = 0
+
+    # (home + j * j) and (home + (capacity - j) ** 2) are the same bucket, so
+    # probes past capacity // 2 reach nothing new
+    rounds = min(capacity // 2 + 1, max_probes)
+    for j in range(rounds):
+        slots = (homes + j * j) % capacity
+        free = ~occupied[slots]
+        claimed, first = np.unique(slots[free], return_index=True)
+        occupied[claimed] = True
+        pending[np.flatnonzero(free)[first]] -= 1  # one key of each winning home
+
+        total_probes += claimed.size * (j + 1)
+        placed += claimed.size
+        if claimed.size:
+            max_seen = j + 1
+
+        keep = pending > 0
+        homes, pending = homes[keep], pending[keep]
+        if not homes.size or placed == capacity:
+            break
+
+    unplaced = n - placed
+    return {
+        'oa_mean_probes': total_probes / placed if placed else 0.0,
+        'oa_max_probes': max_seen,
+        'oa_unplaced': unplaced,
+        'oa_truncated': bool(unplaced) and j + 1 == max_probes and placed < capacity,
+    }
+
+
+def avalanche_stats(function, keys, sample: int = 1000) -> dict:
+    """
+    Flips each of the low 7 bits of every character of up to `sample` string keys
+    and records which of the 64 output bits change. A good hash flips each output
+    bit with probability 0.5; reports the mean flip probability and the worst
+    single-bit deviation from 0.5.
+    """
+    diffs = []
+    for key in keys:
+        if not isinstance(key, str):
+            continue
+        base = function(key) & _HASH_MASK
+        for pos, char in enumerate(key):
+            for bit in range(7):
+                flipped = key[:pos] + chr(ord(char) ^ (1 << bit)) + key[pos + 1:]
+                diffs.append((function(flipped) & _HASH_MASK) ^ base)
+        sample -= 1
+        if sample == 0:
+            break
+
+    if not diffs:
+        return {'avalanche_mean': None, 'avalanche_worst_bias': None}
+
+    bits = np.unpackbits(np.array(diffs, dtype='<u8').view(np.uint8).reshape(-1, 8), axis=1)
+    flip_rate = bits.mean(axis=0)
+    return {
+        'avalanche_mean': float(flip_rate.mean()),
+        'avalanche_worst_bias': float(np.abs(flip_rate - 0.5).max()),
+    }
+
+
+def analyze(function, keys, capacity: int, sample: int = 1000) -> dict:
+    """
+    Returns a report (dict) on how well the hash function spreads the keys over
+    a table with the given number of buckets. Keys are assumed to be distinct,
+    so duplicates show up as hash collisions.
+    """
+    keys = keys if isinstance(keys, list) else list(keys)
+    hashes = hash_keys(function, keys)
+
+    report = {'keys': hashes.size, 'capacity': capacity,
+              'hash_collisions': hashes.size - np.unique(hashes).size}
+    report.update(bucket_stats(hashes, capacity))
+    report.update(quadratic_probe_stats(hashes, capacity))
+    report.update(avalanche_stats(function, keys, sample))
+    return report
+
+
+def format_report(report: dict) -> str:
+    """
+    Returns the report as readable text.
+    """
+    out = f"keys: {report['keys']}  capacity: {report['capacity']}  " \
+          f"load factor: {report['load_factor']:.3f}\n"
+    out += f"empty buckets: {report['empty_buckets']} " \
+           f"(uniform hash: {report['expected_empty_buckets']:.0f})\n"
+    out += f"chi-squared: {report['chi_squared']:.1f} " \
+           f"(uniform hash: ~{report['chi_squared_expected']})\n"
+    out += f"full-hash collisions: {report['hash_collisions']}  " \
+           f"bucket collisions: {report['bucket_collisions']}\n"
+    out += f"SC chains: max {report['sc_max_chain']}  mean {report['sc_mean_chain']:.2f}  " \
+           f"mean probes per hit {report['sc_mean_probes']:.2f}\n"
+    if report['oa_mean_probes'] is None:
+        out += "OA quadratic probing: not simulated (at least as many keys as buckets)\n"
+    else:
+        out += f"OA quadratic probing: mean {report['oa_mean_probes']:.2f}  " \
+               f"max {report['oa_max_probes']}  unplaced {report['oa_unplaced']}"
+        out += f" (stopped after {_MAX_PROBES} probes)\n" if report['oa_truncated'] else "\n"
+    if report['avalanche_mean'] is not None:
+        out += f"avalanche: mean flip rate {report['avalanche_mean']:.3f} (ideal 0.5)  " \
+               f"worst bit bias {report['avalanche_worst_bias']:.3f}\n"
+    out += "occupancy histogram (chain length: buckets):\n"
+    for length, buckets in report['occupancy_histogram'].items():
+        out += f"  {length}: {buckets}\n"
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report on the quality of a hash function for a key corpus.")
+    parser.add_argument('keys_file', help="file with one key per line")
+    parser.add_argument('capacity', type=int, help="number of buckets to spread the keys over")
+    parser.add_argument('--function', default='hash_function_1',
+                        help="name of a hash function in a6_include (default: hash_function_1)")
+    parser.add_argument('--sample', type=int, default=1000,
+                        help="number of keys used for the avalanche test (default: 1000)")
+    args = parser.parse_args()
+
+    function = getattr(a6_include, args.function)
+    with open(args.keys_file, encoding='utf-8') as keys_file:
+        keys = [line.rstrip('\n') for line in keys_file]
+    print(format_report(analyze(function, keys, args.capacity, args.sample)), end='')
+
+
+if __name__ == "__main__":
+    main()
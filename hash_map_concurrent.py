@@ -0,0 +1,327 @@
+# Description: Thread-safe Separate Chaining HashMap using lock striping. The buckets
+#              are split into stripes (every stripes-th bucket) that each have a lock,
+#              so writes to different stripes don't wait for each other, and reads
+#              take no lock at all: each bucket is an immutable tuple of hash, key,
+#              value triples that writers replace as a whole. A resize takes every
+#              stripe lock and publishes the new bucket array with one assignment.
+#              Nothing relies on the GIL, so it also holds on free-threaded builds.
+
+import threading
+from contextlib import contextmanager
+
+from a6_include import DynamicArray, HashMapView, hash_function_1
+from capacity_policy import PowerOfTwoCapacity
+
+_STRIPES = 16
+_MAX_LOAD = 1  # keys per bucket that trigger a resize, as in the SC HashMap
+
+
+def _find(bucket: tuple, key: str, hash_code: int) -> int:
+    """
+    Returns the position of the given key's triple in a bucket, or -1.
+    """
+    if bucket is not None:
+        for i in range(0, len(bucket), 3):
+            if bucket[i] == hash_code and bucket[i + 1] == key:
+                return i
+    return -1
+
+
+class ConcurrentHashMap:
+    def __init__(self, capacity: int = 11, function=hash_function_1,
+                 stripes: int = _STRIPES) -> None:
+        """
+        Initialize a new thread-safe HashMap with the given number of stripe locks.
+        Both the stripe count and the capacity are powers of two (see
+        PowerOfTwoCapacity) and the capacity is at least the stripe count, so the
+        stripe of a bucket is its index & (stripes - 1) and stays the same when
+        the table grows.
+        """
+        stripes = PowerOfTwoCapacity.round_up(stripes)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._sizes = [0] * stripes  # keys in each stripe, changed under its lock
+        self._stripe_mask = stripes - 1
+
+        capacity = PowerOfTwoCapacity.round_up(max(capacity, stripes))
+        # buckets and mask are published together, so a reader never pairs
+        # one bucket array with the other's capacity
+        self._table = (DynamicArray(length=capacity), capacity - 1)
+        self._hash_function = PowerOfTwoCapacity.hash_function(function)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        buckets, mask = self._table
+        out = ''
+        for i in range(mask + 1):
+            bucket = buckets[i] or ()
+            pairs = ', '.join(f"({bucket[j + 1]}: {bucket[j + 2]})" for j in range(0, len(bucket), 3))
+            out += str(i) + ': ' + pairs + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(self._sizes)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table[1] + 1
+
+    # ------------------------------------------------------------------ #
+
+    @contextmanager
+    def _all_stripes(self):
+        """
+        Holds every stripe lock, taken in order so two threads doing this can't deadlock.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every entry to a new bucket array of the given capacity using the
+        cached hashes. Must be called with every stripe lock held.
+        """
+        old_buckets, old_mask = self._table
+        mask = new_capacity - 1
+        chains = [None] * new_capacity
+        for i in range(old_mask + 1):
+            bucket = old_buckets[i]
+            if bucket is not None:
+                for j in range(0, len(bucket), 3):
+                    idx = bucket[j] & mask
+                    if chains[idx] is None:
+                        chains[idx] = []
+                    chains[idx] += bucket[j:j + 3]
+
+        buckets = DynamicArray(length=new_capacity)
+        for idx, chain in enumerate(chains):
+            if chain is not None:
+                buckets[idx] = tuple(chain)
+        self._table = (buckets, mask)
+
+
+    def _grow_if_full(self, capacity: int) -> None:
+        """
+        Doubles the capacity once the map holds more keys than the given capacity
+        allows, unless another thread has already resized the table since it had
+        that capacity. The stripe sizes are summed without their locks, so the
+        check may lag a concurrent put by a key; it is repeated under the locks.
+        """
+        if sum(self._sizes) <= capacity * _MAX_LOAD:
+            return
+        with self._all_stripes():
+            if self._table[1] + 1 == capacity and sum(self._sizes) > capacity * _MAX_LOAD:
+                self._rehash(capacity * 2)
+
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key already exists,
+        its value is replaced by the new value. If the key doesn't exist,
+        a new key/value pair is added.
+        """
+        hash_code = self._hash_function(key)
+        stripe = hash_code & self._stripe_mask
+        with self._locks[stripe]:
+            buckets, mask = self._table
+            idx = hash_code & mask
+            bucket = buckets[idx]
+            i = _find(bucket, key, hash_code)
+            if i >= 0:
+                buckets[idx] = bucket[:i + 2] + (value,) + bucket[i + 3:]
+                return
+            buckets[idx] = (hash_code, key, value) if bucket is None else bucket + (hash_code, key, value)
+            self._sizes[stripe] += 1
+
+        self._grow_if_full(mask + 1)
+
+
+    def _upsert(self, key: str, fn, default: object) -> object:
+        """
+        Does the work of setdefault(), update_with() and increment() atomically
+        under the key's stripe lock: replaces the key's value by fn(value), or adds
+        the key with fn(default) (with fn=None, keeps the value or adds default).
+        Returns the key's value.
+        """
+        hash_code = self._hash_function(key)
+        stripe = hash_code & self._stripe_mask
+        with self._locks[stripe]:
+            buckets, mask = self._table
+            idx = hash_code & mask
+            bucket = buckets[idx]
+            i = _find(bucket, key, hash_code)
+            if i >= 0:
+                if fn is None:
+                    return bucket[i + 2]
+                value = fn(bucket[i + 2])
+                buckets[idx] = bucket[:i + 2] + (value,) + bucket[i + 3:]
+                return value
+
+            value = default if fn is None else fn(default)
+            buckets[idx] = (hash_code, key, value) if bucket is None else bucket + (hash_code, key, value)
+            self._sizes[stripe] += 1
+
+        self._grow_if_full(mask + 1)
+        return value
+
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in the
+        hash map, it is added with the given default value, which is returned.
+        """
+        return self._upsert(key, None, default)
+
+
+    def update_with(self, key: str, fn, default: object = None) -> object:
+        """
+        Atomically replaces the value associated with the given key by fn(value), or
+        adds the key with the value fn(default), and returns the new value. fn runs
+        while the key's stripe is locked, so it must not use the hash map.
+        """
+        return self._upsert(key, fn, default)
+
+
+    def increment(self, key: str, delta: int = 1) -> object:
+        """
+        Atomically adds delta to the value associated with the given key, or adds the
+        key with the value delta if it is not in the hash map, and returns the new value.
+        """
+        return self._upsert(key, lambda value: value + delta, 0)
+
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+        """
+        buckets, mask = self._table
+        return sum(1 for i in range(mask + 1) if buckets[i] is None)
+
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor.
+        """
+        return self.get_size() / self.get_capacity()
+
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the underlying hash
+        table capacity.
+        """
+        with self._all_stripes():
+            capacity = self._table[1] + 1
+            self._table = (DynamicArray(length=capacity), capacity - 1)
+            self._sizes = [0] * len(self._locks)
+
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table, rounded up to a power of two
+        (and to at least the number of stripes). All entries are moved to the new
+        table using their cached hashes.
+        """
+        with self._all_stripes():
+            size = sum(self._sizes)
+            if new_capacity < 1 or new_capacity < size:
+                return
+            capacity = PowerOfTwoCapacity.round_up(max(new_capacity, len(self._locks)))
+            while size / capacity > _MAX_LOAD:
+                capacity *= 2
+            self._rehash(capacity)
+
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in the hash
+        map, the method returns None. Takes no lock.
+        """
+        hash_code = self._hash_function(key)
+        buckets, mask = self._table
+        bucket = buckets[hash_code & mask]
+        i = _find(bucket, key, hash_code)
+        if i >= 0:
+            return bucket[i + 2]
+
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it returns False.
+        Takes no lock.
+        """
+        hash_code = self._hash_function(key)
+        buckets, mask = self._table
+        return _find(buckets[hash_code & mask], key, hash_code) >= 0
+
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        """
+        hash_code = self._hash_function(key)
+        stripe = hash_code & self._stripe_mask
+        with self._locks[stripe]:
+            buckets, mask = self._table
+            idx = hash_code & mask
+            bucket = buckets[idx]
+            i = _find(bucket, key, hash_code)
+            if i >= 0:
+                buckets[idx] = bucket[:i] + bucket[i + 3:] or None
+                self._sizes[stripe] -= 1
+
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+        """
+        dynamic_array = DynamicArray()
+        dynamic_array.extend(self._iter_items())
+        return dynamic_array
+
+
+    def _iter_items(self):
+        """
+        Yields each key/value pair of the bucket array in use when iteration starts.
+        Takes no lock; each bucket is seen as it was when reached.
+        """
+        buckets, mask = self._table
+        for i in range(mask + 1):
+            bucket = buckets[i]
+            if bucket is not None:
+                for j in range(0, len(bucket), 3):
+                    yield bucket[j + 1], bucket[j + 2]
+
+
+    def keys(self) -> HashMapView:
+        """
+        Returns a lazy view of the keys in the hash map.
+        """
+        return HashMapView(self, 0)
+
+
+    def values(self) -> HashMapView:
+        """
+        Returns a lazy view of the values in the hash map.
+        """
+        return HashMapView(self, 1)
+
+
+    def items(self) -> HashMapView:
+        """
+        Returns a lazy view of the key/value pairs in the hash map.
+        """
+        return HashMapView(self)
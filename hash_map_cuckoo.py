@@ -0,0 +1,302 @@
+# Description: Implementation of a HashMap with cuckoo hashing. Every key has exactly one
+#              candidate bucket in each of two tables plus a stash of at most four
+#              entries, so a lookup checks a fixed number of slots no matter how full
+#              the map is. Each table's bucket comes from a seeded hash of the key
+#              itself (not a remix of the map's hash code), so keys that collide under
+#              the map's hash function, as many do under hash_function_1, still get
+#              different buckets; reseeding separates keys that collide under a seed.
+#              Keys whose seeded hashes are identical under every seed can't be
+#              separated at all: once the capped reseeds and growth have failed, the
+#              stash takes them beyond its four entries, and lookups of those keys
+#              scan it.
+
+from a6_include import DynamicArray, HashEntry, mix_hash, hash_function_fnv1a
+
+_TABLES = 2  # number of tables, i.e. of seeded hash functions
+_STASH_SIZE = 4  # entries that may live outside the tables
+_MAX_KICKS = 64  # evictions tried before an entry is stashed
+_REHASH_ATTEMPTS = 3  # new seed sets tried before the tables are grown
+_MAX_GROWTH = 2  # times a rebuild may double the tables it was asked for
+_MAX_LOAD = 0.45  # two-table cuckoo hashing breaks down close to 0.5
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, seeded_function=hash_function_fnv1a) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution.
+        function's hash is cached and compared before keys; seeded_function(key, seed)
+        picks each table's bucket (hash_function_builtin is faster, but keys with the
+        same hash() share their buckets under every seed).
+        """
+        self._hash_function = function
+        self._seeded_function = seeded_function
+        self._generation = 0
+        self._allocate(self._table_size_for(capacity))
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for t in range(_TABLES):
+            for i in range(self._table_size):
+                out += f"{t}.{i}: {self._tables[t][i]}\n"
+        out += 'stash: ' + ', '.join(str(entry) for entry in self._stash) + '\n'
+        return out
+
+    @staticmethod
+    def _table_size_for(capacity: int) -> int:
+        """
+        Return the size of each table (a power of two) needed for
+        at least the given total number of slots
+        """
+        table_size = 1
+        while table_size * _TABLES < capacity:
+            table_size *= 2
+        return table_size
+
+    def _allocate(self, table_size: int) -> None:
+        """
+        Replace the tables with empty tables of the given size, using a fresh
+        set of seeds for the hash functions
+        """
+        self._generation += 1
+        self._seeds = [mix_hash(self._generation * _TABLES + t) for t in range(_TABLES)]
+        self._table_size = table_size
+        self._tables = [DynamicArray(length=table_size) for _ in range(_TABLES)]
+        self._stash = []
+        self._stash_size = _STASH_SIZE
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map (total number of table slots)
+        """
+        return self._table_size * _TABLES
+
+    # ------------------------------------------------------------------ #
+
+    def _index(self, table: int, key: str) -> int:
+        """
+        Returns the bucket of the given table for a key,
+        using that table's seed.
+        """
+        return self._seeded_function(key, self._seeds[table]) & (self._table_size - 1)
+
+
+    def _find_entry(self, key: str, hash_code: int) -> HashEntry:
+        """
+        Returns the entry holding the given key, or None if the key is not
+        in the hash map. Checks one bucket per table plus the stash.
+        """
+        for t in range(_TABLES):
+            entry = self._tables[t][self._index(t, key)]
+            if entry is not None and entry.hash == hash_code and entry.key == key:
+                return entry
+
+        for entry in self._stash:
+            if entry.hash == hash_code and entry.key == key:
+                return entry
+
+
+    def _insert_entry(self, entry: HashEntry) -> HashEntry:
+        """
+        Stores an entry whose key is not in the hash map, evicting occupants to
+        their other table as needed and stashing the last one if that goes on
+        too long. Returns None on success, or the entry left without a place
+        when the stash is full as well.
+        """
+        for t in range(_TABLES):
+            idx = self._index(t, entry.key)
+            if self._tables[t][idx] is None:
+                self._tables[t][idx] = entry
+                return None
+
+        t = 0
+        for _ in range(_MAX_KICKS):
+            idx = self._index(t, entry.key)
+            entry, self._tables[t][idx] = self._tables[t][idx], entry
+            if entry is None:
+                return None
+            t = (t + 1) % _TABLES  # the evicted entry moves to its next table
+
+        if len(self._stash) < self._stash_size:
+            self._stash.append(entry)
+            return None
+        return entry
+
+
+    def _rebuild(self, table_size: int, entries: list) -> None:
+        """
+        Re-inserts the given entries into fresh tables of the given size,
+        trying new seeds after a cycle (or a full stash) and growing the tables
+        when several seed sets in a row fail. If the tables have grown
+        _MAX_GROWTH times and still fail, growing didn't help: the entries no
+        seed can separate are left, at the size asked for, in a stash that is
+        allowed to hold all of them.
+        """
+        size = table_size
+        for attempt in range(1, _REHASH_ATTEMPTS * (_MAX_GROWTH + 1) + 1):
+            self._allocate(size)
+            if all(self._insert_entry(entry) is None for entry in entries):
+                break
+            if attempt % _REHASH_ATTEMPTS == 0:
+                size *= 2
+        else:
+            self._allocate(table_size)
+            self._stash_size = len(entries)
+            for entry in entries:
+                self._insert_entry(entry)
+            self._stash_size = max(_STASH_SIZE, len(self._stash))
+
+        self._size = len(entries)
+
+
+    def _entries(self) -> list:
+        """
+        Returns a list of every entry in the tables and the stash.
+        """
+        entries = []
+        for table in self._tables:
+            entries.extend(entry for entry in table if entry is not None)
+        entries.extend(self._stash)
+        return entries
+
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key already exists,
+        its value is replaced by the new value. If the key doesn't exist,
+        a new key/value pair is added.
+        """
+        hash_code = self._hash_function(key)
+        entry = self._find_entry(key, hash_code)
+        if entry is not None:
+            entry.value = value
+            return
+
+        if (self._size + 1) / self.get_capacity() > _MAX_LOAD:
+            self._rebuild(self._table_size * 2, self._entries())
+
+        entry = HashEntry(key, value, hash_code)
+        homeless = self._insert_entry(entry)
+        if homeless is None:
+            self._size += 1
+        else:
+            # cycle: every entry still placed plus the one that was pushed out
+            self._rebuild(self._table_size, self._entries() + [homeless])
+
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor.
+        """
+        return self._size / self.get_capacity()
+
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+        """
+        return self.get_capacity() - (self._size - len(self._stash))
+
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table, rounded up to two tables
+        of a power-of-two size. Entries are placed using their cached hashes.
+        """
+        if new_capacity < self._size:
+            return
+
+        table_size = self._table_size_for(new_capacity)
+        while self._size > table_size * _TABLES * _MAX_LOAD:
+            table_size *= 2
+        self._rebuild(table_size, self._entries())
+
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, the method returns None.
+        """
+        entry = self._find_entry(key, self._hash_function(key))
+        if entry is not None:
+            return entry.value
+
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map,
+        otherwise it returns False.
+        """
+        return self._find_entry(key, self._hash_function(key)) is not None
+
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        """
+        hash_code = self._hash_function(key)
+        for t in range(_TABLES):
+            idx = self._index(t, key)
+            entry = self._tables[t][idx]
+            if entry is not None and entry.hash == hash_code and entry.key == key:
+                self._tables[t][idx] = None
+                self._size -= 1
+                self._unstash()
+                return
+
+        for i, entry in enumerate(self._stash):
+            if entry.hash == hash_code and entry.key == key:
+                self._stash.pop(i)
+                self._size -= 1
+                return
+
+
+    def _unstash(self) -> None:
+        """
+        Moves stashed entries back into the tables where a bucket has freed up.
+        """
+        for entry in list(self._stash):
+            for t in range(_TABLES):
+                idx = self._index(t, entry.key)
+                if self._tables[t][idx] is None:
+                    self._tables[t][idx] = entry
+                    self._stash.remove(entry)
+                    break
+
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the underlying hash
+        table capacity.
+        """
+        self._allocate(self._table_size)
+        self._size = 0
+
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+        """
+        dynamic_array = DynamicArray()
+        for entry in self._entries():
+            dynamic_array.append((entry.key, entry.value))
+        return dynamic_array
+
+
+    def __iter__(self):
+        """
+        Lets the hash map iterate across itself, yielding each HashEntry.
+        """
+        for entry in self._entries():
+            yield entry
@@ -0,0 +1,467 @@
+# Description: Read-only snapshot of an SC or OA HashMap in one flat buffer, which can
+#              be placed in shared memory so that other processes look keys up in it
+#              without building their own copy of the map, or saved to a file that
+#              load() memory-maps, so a restart doesn't put every key again. The
+#              buffer holds the cached hashes, an open addressing slot table over them,
+#              and each key and value encoded, so a lookup decodes nothing but the
+#              value it returns (and keys that aren't str, when their hash matches).
+#              The hash function is stored by name and must be one of those allowed
+#              by _HASH_FUNCTIONS; keys and values other than str, bytes and int are
+#              pickled, so only open snapshots from a trusted source.
+#
+#              Layout (arrays in native byte order, each section 8-byte aligned):
+#                header          magic, version, entries, slots, probe hash,
+#                                function name length, data length
+#                hashes          entries x uint64, cached hash & (2**64 - 1), sorted
+#                                so the entries of each hash are next to each other
+#                offsets         (2 * entries + 1) x uint64 into data: entry i's key
+#                                starts at offsets[2i] and its value at offsets[2i + 1]
+#                slot table      slots x uint32, index + 1 of the first entry of
+#                                each distinct hash or 0 when empty, probed
+#                                linearly from mix_hash(hash) & (slots - 1)
+#                function        the name of the map's hash function in UTF-8,
+#                                module.qualname, or mix_hash(module.qualname)
+#                                for a map with power-of-two capacities
+#                data            encoded key then encoded value of each entry: a tag
+#                                byte, then UTF-8 for str, the bytes of bytes, signed
+#                                little-endian for int, or else the object pickled
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from operator import itemgetter
+from multiprocessing.shared_memory import SharedMemory
+
+import a6_include
+from a6_include import DynamicArray, HashMapView, mix_hash
+from capacity_policy import PowerOfTwoCapacity, _finalized
+
+_MAGIC = b'HMAP'
+_VERSION = 3
+_HEADER = struct.Struct('<4sIQQQQQ')
+_HASH_MASK = (1 << 64) - 1
+
+# hashed when a snapshot is frozen and again when it is opened: a different hash
+# means the opening process has its own seed for hash(str), so the cached hashes
+# can't be used there
+_PROBE = "hash seed probe"
+
+# the hash functions a snapshot may name, by module.qualname: opening a snapshot
+# only looks its function up here, so a file can't make the reader run other code
+_HASH_FUNCTIONS = {}
+
+
+def register_hash_function(function) -> None:
+    """
+    Allows maps hashed with the given module-level function to be frozen and
+    opened (in every process that opens them). The hash functions of a6_include
+    are allowed already.
+    """
+    _HASH_FUNCTIONS[f"{function.__module__}.{function.__qualname__}"] = function
+
+
+for _function in (a6_include.hash_function_1, a6_include.hash_function_2,
+                  a6_include.hash_function_builtin, a6_include.hash_function_fnv1a,
+                  a6_include.hash_function_siphash):
+    register_hash_function(_function)
+
+
+def _function_name(function) -> str:
+    """
+    Returns the name a snapshot stores for a map's hash function. Raises
+    ValueError if the function isn't allowed.
+    """
+    if getattr(function, 'func', None) is _finalized and not function.keywords:
+        return f"mix_hash({_function_name(*function.args)})"
+    name = f"{getattr(function, '__module__', None)}.{getattr(function, '__qualname__', None)}"
+    if _HASH_FUNCTIONS.get(name) is not function:
+        raise ValueError(f"can't freeze a map hashed with {function!r}: "
+                         "allow it with register_hash_function() first")
+    return name
+
+
+def _resolve(name: str):
+    """
+    Returns the hash function a snapshot names. Raises ValueError if the name
+    isn't allowed.
+    """
+    if name.startswith('mix_hash(') and name.endswith(')'):
+        return PowerOfTwoCapacity.hash_function(_resolve(name[len('mix_hash('):-1]))
+    try:
+        return _HASH_FUNCTIONS[name]
+    except KeyError:
+        raise ValueError(f"frozen hash map names a hash function that isn't allowed: "
+                         f"{name!r}") from None
+
+
+# tags of the encoded keys and values
+_STR, _BYTES, _INT, _PICKLE = b'sbip'
+
+
+def _padded(size: int) -> int:
+    """
+    Returns the size rounded up to a multiple of 8.
+    """
+    return (size + 7) & ~7
+
+
+def _encode(obj: object) -> bytes:
+    """
+    Returns a key or value encoded for the data section.
+    """
+    if obj.__class__ is str:
+        return b's' + obj.encode('utf-8', 'surrogatepass')
+    if obj.__class__ is bytes:
+        return b'b' + obj
+    if obj.__class__ is int:
+        return b'i' + obj.to_bytes(obj.bit_length() // 8 + 1, 'little', signed=True)
+    return b'p' + pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+
+def _sections(hash_map) -> list:
+    """
+    Returns the sections of a snapshot of the given SC or OA HashMap, each padded
+    to a multiple of 8 bytes but the last. The map's hash function must be
+    allowed by register_hash_function().
+    """
+    function = hash_map._hash_function
+    function_name = _function_name(function).encode('utf-8')
+
+    hashes, offsets = array('Q'), array('Q', [0])
+    data = bytearray()
+    entries = sorted(((hash_code & _HASH_MASK, key, value) for hash_code, key, value
+                      in hash_map._iter_entries()), key=itemgetter(0))
+    for hash_code, key, value in entries:
+        hashes.append(hash_code)
+        data += _encode(key)
+        offsets.append(len(data))
+        data += _encode(value)
+        offsets.append(len(data))
+
+    # only the first entry of each hash gets a slot, so keys sharing a hash don't
+    # make long probe runs; at most half the slots are used, so probes stay short
+    firsts = [entry for entry in range(len(hashes)) if entry == 0 or hashes[entry] != hashes[entry - 1]]
+    slots = array('I', [0]) * PowerOfTwoCapacity.round_up(max(8, 2 * len(firsts)))
+    mask = len(slots) - 1
+    for entry in firsts:
+        idx = mix_hash(hashes[entry]) & mask
+        while slots[idx]:
+            idx = (idx + 1) & mask
+        slots[idx] = entry + 1
+
+    header = _HEADER.pack(_MAGIC, _VERSION, len(hashes), len(slots), function(_PROBE) & _HASH_MASK,
+                          len(function_name), len(data))
+    sections = []
+    for section in (header, hashes, offsets, slots, function_name):
+        section = section if isinstance(section, bytes) else section.tobytes()
+        sections.append(section + bytes(_padded(len(section)) - len(section)))
+    sections.append(data)
+    return sections
+
+
+def freeze(hash_map) -> bytes:
+    """
+    Returns a snapshot of the given SC or OA HashMap in the layout described above.
+    """
+    return b''.join(_sections(hash_map))
+
+
+def save(hash_map, path: str) -> None:
+    """
+    Writes a snapshot of the given SC or OA HashMap to a file, which load() opens.
+    The snapshot is written to a temporary file that then replaces the given one,
+    so a save that fails or is interrupted never leaves a partial file behind.
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"  # same directory, so os.replace() is atomic
+    try:
+        with open(temporary, 'wb') as file:
+            for section in _sections(hash_map):
+                file.write(section)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+
+class FrozenHashMap:
+    def __init__(self, buffer, resource=None) -> None:
+        """
+        Initialize a read-only map over a buffer holding a snapshot made by
+        freeze(). Nothing is copied: lookups read the buffer in place. resource
+        (such as the SharedMemory the buffer belongs to) is closed by close().
+        The buffer must come from a trusted source: keys and values that aren't
+        str, bytes or int are unpickled when they are read.
+        """
+        self._views = [memoryview(buffer)]
+        self._resource = resource
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        """
+        Checks the header and section sizes against the buffer, sets up a view of
+        each section and looks up the hash function. Raises ValueError if the buffer
+        doesn't hold a whole snapshot (such as a truncated file) or names a hash
+        function that isn't allowed.
+        """
+        view = self._views[0]
+        if len(view) < _HEADER.size:
+            raise ValueError("buffer does not hold a frozen hash map")
+        magic, version, entries, slots, probe, function_len, data_len = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("buffer does not hold a frozen hash map")
+        if slots < 8 or slots & (slots - 1):
+            raise ValueError("frozen hash map has a corrupt header")
+
+        offset = _HEADER.size
+        for size in (8 * entries, 8 * (2 * entries + 1), 4 * slots, function_len):
+            offset = _padded(offset + size)
+        if offset + data_len > len(view):
+            raise ValueError(f"frozen hash map is truncated: {len(view)} bytes "
+                             f"of {offset + data_len}")
+
+        offset = _HEADER.size
+        self._hashes, offset = self._section(offset, 8 * entries, 'Q')
+        self._offsets, offset = self._section(offset, 8 * (2 * entries + 1), 'Q')
+        self._slots, offset = self._section(offset, 4 * slots, 'I')
+        function_name, offset = self._section(offset, function_len)
+        self._data, _ = self._section(offset, data_len)
+        if self._offsets[0] != 0 or self._offsets[-1] != data_len:
+            raise ValueError("frozen hash map has corrupt offsets")
+
+        self._size = entries
+        self._mask = slots - 1
+        try:
+            self._hash_function = _resolve(str(function_name, 'utf-8'))
+        except UnicodeDecodeError:
+            raise ValueError("frozen hash map has a corrupt hash function name") from None
+        if self._hash_function(_PROBE) & _HASH_MASK != probe:
+            raise ValueError("this process hashes keys differently than the one that froze "
+                             "the map (set PYTHONHASHSEED, or use a hash function that "
+                             "doesn't depend on hash())")
+
+    def __enter__(self) -> "FrozenHashMap":
+        """Return the map, which is closed when the with block ends."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the map."""
+        self.close()
+
+    def _section(self, offset: int, size: int, format: str = None) -> tuple:
+        """
+        Returns a view of size bytes of the buffer from offset (cast to the given
+        array format) and the 8-aligned offset of the next section.
+        """
+        view = self._views[0][offset:offset + size]
+        if format is not None:
+            view = view.cast(format)
+        self._views.append(view)
+        return view, _padded(offset + size)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._mask + 1
+
+    def get_name(self) -> str:
+        """
+        Return the name other processes attach() to, if the map is in shared memory
+        """
+        return getattr(self._resource, 'name', None)
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: object) -> int:
+        """
+        Returns the index of the entry holding the given key, or -1. Raises
+        ValueError if the slot table has no empty slot to stop at (a valid
+        snapshot always has one), rather than probing it forever.
+        """
+        hash_code = self._hash_function(key) & _HASH_MASK
+        # a str key is compared with the stored bytes, without decoding them
+        encoded = key.encode('utf-8', 'surrogatepass') if key.__class__ is str else None
+        hashes, slots, mask = self._hashes, self._slots, self._mask
+        offsets, data = self._offsets, self._data
+        idx = mix_hash(hash_code) & mask
+        for _ in range(mask + 1):
+            entry = slots[idx] - 1
+            if entry < 0:
+                return -1
+            if hashes[entry] == hash_code:
+                break
+            idx = (idx + 1) & mask
+        else:
+            raise ValueError("frozen hash map has a corrupt slot table")
+
+        # the entries with this hash follow the one in the slot
+        while entry < self._size and hashes[entry] == hash_code:
+            start, end = offsets[2 * entry], offsets[2 * entry + 1]
+            if encoded is not None and data[start] == _STR:
+                if data[start + 1:end] == encoded:
+                    return entry
+            elif self._decode(start, end) == key:
+                return entry
+            entry += 1
+        return -1
+
+
+    def _decode(self, start: int, end: int) -> object:
+        """
+        Returns the key or value encoded in data[start:end].
+        """
+        data = self._data
+        tag, view = data[start], data[start + 1:end]
+        if tag == _STR:
+            return str(view, 'utf-8', 'surrogatepass')
+        if tag == _BYTES:
+            return bytes(view)
+        if tag == _INT:
+            return int.from_bytes(view, 'little', signed=True)
+        return pickle.loads(view)
+
+
+    def _key(self, entry: int) -> object:
+        """
+        Returns the key of the given entry.
+        """
+        return self._decode(self._offsets[2 * entry], self._offsets[2 * entry + 1])
+
+
+    def _value(self, entry: int) -> object:
+        """
+        Returns the value of the given entry.
+        """
+        return self._decode(self._offsets[2 * entry + 1], self._offsets[2 * entry + 2])
+
+
+    def get(self, key: object) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in the hash
+        map, the method returns None.
+        """
+        entry = self._find(key)
+        if entry >= 0:
+            return self._value(entry)
+
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it returns False.
+        """
+        return self._find(key) >= 0
+
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+        """
+        dynamic_array = DynamicArray()
+        dynamic_array.extend(self._iter_items())
+        return dynamic_array
+
+
+    def _iter_items(self):
+        """
+        Yields each key/value pair, in the order of their hashes.
+        """
+        for entry in range(self._size):
+            yield self._key(entry), self._value(entry)
+
+
+    def keys(self) -> HashMapView:
+        """
+        Returns a lazy view of the keys in the hash map.
+        """
+        return HashMapView(self, 0)
+
+
+    def values(self) -> HashMapView:
+        """
+        Returns a lazy view of the values in the hash map.
+        """
+        return HashMapView(self, 1)
+
+
+    def items(self) -> HashMapView:
+        """
+        Returns a lazy view of the key/value pairs in the hash map.
+        """
+        return HashMapView(self)
+
+
+    def close(self) -> None:
+        """
+        Releases the buffer (and closes the resource it came from). The map can't be
+        used afterwards.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._resource is not None:
+            self._resource.close()
+
+
+    def unlink(self) -> None:
+        """
+        Frees the shared memory holding the map once every process has closed it.
+        Only the process that called share() should do this.
+        """
+        self._resource.unlink()
+
+
+def share(hash_map) -> FrozenHashMap:
+    """
+    Freezes the given SC or OA HashMap into a new block of shared memory and returns
+    it as a FrozenHashMap. Other processes open it with attach(map.get_name()); the
+    caller unlinks it when no process needs it any more.
+    """
+    sections = _sections(hash_map)
+    memory = SharedMemory(create=True, size=sum(len(section) for section in sections))
+    offset = 0
+    for section in sections:
+        memory.buf[offset:offset + len(section)] = section
+        offset += len(section)
+    return FrozenHashMap(memory.buf, memory)
+
+
+def attach(name: str) -> FrozenHashMap:
+    """
+    Opens the FrozenHashMap shared under the given name. Before Python 3.13 the
+    attaching process also registers the block with its resource tracker, which is
+    harmless for processes started from the sharing one (they use its tracker),
+    but lets an unrelated process's tracker unlink the block when it exits.
+    """
+    if sys.version_info >= (3, 13):
+        memory = SharedMemory(name, track=False)
+    else:
+        memory = SharedMemory(name)
+    return FrozenHashMap(memory.buf, memory)
+
+
+def load(path: str) -> FrozenHashMap:
+    """
+    Opens a file written by save() as a FrozenHashMap. The file is memory-mapped,
+    not read: opening it costs the same for any number of entries, and lookups
+    only bring in the pages they touch.
+    """
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return FrozenHashMap(mapped, mapped)
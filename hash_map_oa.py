@@ -4,27 +4,61 @@
 # Description: Implementation of a Hashmap with Open Addressing
 # Sources Cited: Skeleton code owned and provided by the professors at Oregon State University
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
+from array import array
+
+from a6_include import (DynamicArray, HashEntry, HashMapView, to_list,
                         hash_function_1, hash_function_2)
+from capacity_policy import PrimeCapacity, PowerOfTwoCapacity
+import hash_map_frozen
+
+# slot states used by FlatHashMap
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+_HASH_MASK = (1 << 64) - 1  # cached hashes are stored as unsigned 64-bit ints
+
+# number of old buckets migrated by each operation during an incremental resize
+_REHASH_STEP = 8
+
+# left behind in old buckets whose entry has been migrated, so that
+# probe sequences running through them stay intact
+_MOVED = HashEntry(None, None)
+_MOVED.is_tombstone = True
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, incremental: bool = False,
+                 power_of_two: bool = False) -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        quadratic probing for collision resolution.
+        With incremental=True, growing the table keeps the old bucket array
+        around and migrates a few buckets per operation instead of
+        rehashing every entry inside a single put().
+        With power_of_two=True, the capacity is a power of two, buckets are
+        picked by masking mix_hash-finalized hashes and probing is triangular
+        (quadratic probing only reaches every bucket of a prime-sized table).
         """
-        self._buckets = DynamicArray()
+        self._policy = PowerOfTwoCapacity if power_of_two else PrimeCapacity
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        # capacity must be a prime number (or a power of two)
+        self._capacity = self._policy.round_up(capacity)
+        self._buckets = DynamicArray(length=self._capacity)
 
-        self._hash_function = function
+        # cached hashes are finalized ones, so rehashing needs no extra work
+        self._hash_function = self._policy.hash_function(function)
         self._size = 0
 
+        self._tombstones = 0  # tombstones in self._buckets
+        self._longest_probe = 0  # most buckets probed by an insert into self._buckets
+
+        self._incremental = incremental
+        self._old_buckets = None  # bucket array being migrated from, if any
+        self._old_capacity = 0
+        self._old_entries = 0  # live entries still in the old bucket array
+        self._rehash_idx = 0  # next old bucket to migrate
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -90,23 +124,229 @@ class HashMap:
         its value is replaced by the new value. If the key doesn't exist, 
         a new key/value pair is added.
         """
-        if self.table_load() >= 0.5:
-            new_capacity = self._capacity * 2 
-            self.resize_table(new_capacity)
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+        self._make_room()
+
+        hash_code = self._hash_function(key)
+        entry = self._find_entry(key, hash_code)
+        if entry is not None:
+            entry.value = value  # updates the value if the key exists
+        else:
+            self._place(HashEntry(key, value, hash_code))
+            self._size += 1
 
-        idx = self._hash_function(key) % self._capacity
-        hash_entry = HashEntry(key, value)
-        j = 0
-        probe_idx = (idx + (j * j)) % self._capacity  # quad probing
 
-        while self._buckets[probe_idx] != hash_entry:
-            probe_idx = (idx + (j * j)) % self._capacity
-            if self._buckets[probe_idx] is None or self._buckets[probe_idx].is_tombstone: 
-                self._buckets[probe_idx] = hash_entry
-                self._size += 1
-            if self._buckets[probe_idx].key == key:
-                self._buckets[probe_idx] = hash_entry
+    def _make_room(self) -> None:
+        """
+        Doubles the capacity, or clears the tombstones if they outnumber the
+        live entries, before a key is added if the load has reached 0.5.
+        """
+        # tombstones lengthen probe sequences just like live entries do
+        if (self._size + self._tombstones) / self._capacity >= 0.5:
+            if self._tombstones > self._size:
+                self._compact()
+            else:
+                new_capacity = self._capacity * 2 
+                if self._incremental:
+                    self._start_rehash(new_capacity)
+                else:
+                    self.resize_table(new_capacity)
+
+
+    def _upsert(self, key: str, fn, default: object) -> object:
+        """
+        Does the work of setdefault(), update_with() and increment(): finds the
+        key's entry once and replaces its value by fn(value), or adds the key with
+        fn(default). With fn=None, an existing value is kept and default is added.
+        Returns the key's value.
+        """
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+        self._make_room()
+
+        hash_code = self._hash_function(key)
+        entry = self._find_entry(key, hash_code)
+        if entry is not None:
+            if fn is not None:
+                entry.value = fn(entry.value)
+            return entry.value
+
+        value = default if fn is None else fn(default)
+        self._place(HashEntry(key, value, hash_code))
+        self._size += 1
+        return value
+
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in the
+        hash map, it is added with the given default value, which is returned.
+        """
+        return self._upsert(key, None, default)
+
+
+    def update_with(self, key: str, fn, default: object = None) -> object:
+        """
+        Replaces the value associated with the given key by fn(value), or adds the
+        key with the value fn(default) if it is not in the hash map, and returns the
+        new value. Unlike a get() followed by a put(), the key is looked up once.
+        """
+        return self._upsert(key, fn, default)
+
+
+    def increment(self, key: str, delta: int = 1) -> object:
+        """
+        Adds delta to the value associated with the given key, or adds the key
+        with the value delta if it is not in the hash map, and returns the new value.
+        """
+        return self._upsert(key, lambda value: value + delta, 0)
+
+
+    def _find_entry(self, key: str, hash_code: int) -> HashEntry:
+        """
+        Returns the live entry holding the given key, or None if the key
+        is not in the hash map. While a resize is in progress, the old
+        bucket array is searched as well.
+        """
+        entry = self._probe(self._buckets, self._capacity, key, hash_code)
+        if entry is None and self._old_buckets is not None:
+            entry = self._probe(self._old_buckets, self._old_capacity, key, hash_code)
+        return entry
+
+
+    def _probe(self, buckets: DynamicArray, capacity: int, key: str, hash_code: int) -> HashEntry:
+        """
+        Walks the probe sequence of a key in the given bucket array and returns
+        its live entry, or None. The cached hash is compared before the key;
+        a tombstone's hash never matches, so tombstones are skipped by it too.
+        """
+        if self._policy.power_of_two:
+            mask = capacity - 1
+            probe_idx = hash_code & mask
+            j = 0
+
+            while buckets[probe_idx] is not None and j < capacity:
+                entry = buckets[probe_idx]
+                if entry.hash == hash_code and entry.key == key:
+                    return entry
+                j += 1
+                probe_idx = (probe_idx + j) & mask  # triangular probing
+            return None
+
+        idx = hash_code % capacity
+        j = 0
+        probe_idx = idx  # quad probing
+
+        # quadratic probing may never reach an empty bucket, so stop after
+        # capacity steps, as FlatHashMap does
+        while buckets[probe_idx] is not None and j < capacity:
+            entry = buckets[probe_idx]
+            if entry.hash == hash_code and entry.key == key:
+                return entry
             j += 1
+            probe_idx = (idx + (j * j)) % capacity
+
+
+    def _place(self, hash_entry: HashEntry) -> None:
+        """
+        Stores an entry whose key is not in the hash map in the first empty
+        or tombstone bucket of its probe sequence.
+        """
+        if self._policy.power_of_two:
+            mask = self._capacity - 1
+            probe_idx = hash_entry.hash & mask
+            j = 0
+
+            while self._buckets[probe_idx] is not None and not self._buckets[probe_idx].is_tombstone:
+                j += 1
+                probe_idx = (probe_idx + j) & mask  # triangular probing
+        else:
+            idx = hash_entry.hash % self._capacity
+            j = 0
+            probe_idx = idx  # quad probing
+
+            while self._buckets[probe_idx] is not None and not self._buckets[probe_idx].is_tombstone:
+                j += 1
+                probe_idx = (idx + (j * j)) % self._capacity
+
+        if self._buckets[probe_idx] is not None:
+            self._tombstones -= 1  # reusing a tombstone
+        self._buckets[probe_idx] = hash_entry
+        if j >= self._longest_probe:
+            self._longest_probe = j + 1
+
+
+    def _compact(self) -> None:
+        """
+        Rehashes the live entries at the current capacity, clearing every tombstone.
+        Done at once into a fresh bucket array, or as a same-capacity migration in
+        incremental mode.
+        """
+        if self._incremental:
+            self._start_rehash(self._capacity)
+            return
+
+        live_entries = [entry for entry in self._buckets
+                        if entry is not None and entry.is_tombstone is False]
+
+        self._buckets = DynamicArray(length=self._capacity)
+        self._tombstones = 0
+        self._longest_probe = 0
+        for entry in live_entries:
+            self._place(entry)
+
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Allocates a new bucket array of (at least) the given capacity and makes
+        the current one the old array that entries are migrated from.
+        """
+        self._finish_rehash()
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._old_entries = self._size
+        self._rehash_idx = 0
+        self._tombstones = 0
+        self._longest_probe = 0
+
+        self._capacity = self._policy.round_up(new_capacity)
+
+        # keep growing the same way put() would while re-inserting
+        while (self._size - 1) / self._capacity >= 0.5:
+            self._capacity = self._policy.round_up(self._capacity * 2)
+
+        self._buckets = DynamicArray(length=self._capacity)
+
+
+    def _rehash_step(self, buckets: int) -> None:
+        """
+        Migrates the live entries of up to the given number of old buckets into
+        the new bucket array, and drops the old array once all of its buckets
+        have been migrated.
+        """
+        old_buckets = self._old_buckets
+        stop = min(self._rehash_idx + buckets, self._old_capacity)
+
+        for idx in range(self._rehash_idx, stop):
+            entry = old_buckets[idx]
+            if entry is not None and entry.is_tombstone is False:
+                self._place(entry)
+                old_buckets[idx] = _MOVED
+                self._old_entries -= 1
+
+        self._rehash_idx = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+
+
+    def _finish_rehash(self) -> None:
+        """
+        Completes a resize that is in progress, if any.
+        """
+        if self._old_buckets is not None:
+            self._rehash_step(self._old_capacity)
 
 
     def table_load(self) -> float:
@@ -121,45 +361,44 @@ class HashMap:
 
     def empty_buckets(self) -> int:
         """
-        Returns the number of empty buckets in the hash table.
+        Returns the number of empty buckets in the hash table. Every entry takes
+        one bucket of the new array once migrated, so an incremental resize in
+        progress doesn't need to finish first.
         """
-        idx = 0 
-        empty_buckets = 0
-        while idx != self._capacity:
-            bucket = self._buckets[idx]
-            if bucket is None or bucket.is_tombstone:
-                empty_buckets += 1
-            idx += 1
-        
-        return empty_buckets
+        return self._capacity - self._size
+
+
+    def stats(self) -> dict:
+        """
+        Returns the map's occupancy counters, which are kept up to date by every
+        operation instead of being counted on demand. longest_probe is the most
+        buckets an insert has probed since the table was last rebuilt, so no
+        lookup probes more. During an incremental resize, the counters describe
+        the new bucket array (entries not yet migrated are left out).
+        """
+        return {
+            'entries': self._size,
+            'capacity': self._capacity,
+            'load_factor': self.table_load(),
+            'empty_buckets': self._capacity - (self._size - self._old_entries),
+            'tombstones': self._tombstones,
+            'longest_probe': self._longest_probe,
+            'rehashing': self._old_buckets is not None,
+        }
 
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Changes the capacity of the internal hash table.
+        Live entries are moved using their cached hashes,
+        so the hash function is not called again.
+        Always completes synchronously, even in incremental mode.
         """
         if new_capacity < self._size:
             return
-        
-        old_size = self._buckets.length()
-        old_array = self._buckets
-        self._buckets =DynamicArray()
-        
-        if self._is_prime(new_capacity):
-            self._capacity = new_capacity
-        else:
-            self._capacity = self._next_prime(new_capacity)
 
-        self._size = 0 #reset before putting in new values
-
-        for _ in range(self._capacity):
-            self._buckets.append(None)
-
-        for idx in range(old_size):
-            if old_array[idx] is not None and old_array[idx].is_tombstone is False:
-                key = old_array[idx].key
-                value = old_array[idx].value
-                self.put(key, value)
+        self._start_rehash(new_capacity)
+        self._finish_rehash()
 
 
     def get(self, key: str) -> object:
@@ -167,17 +406,12 @@ class HashMap:
         Returns the value associated with the given key.
         If the key is not in the hash map, the method returns None.
         """
-        idx = self._hash_function(key) % self._capacity
-        j = 0
-        probe_idx = (idx + (j * j)) % self._capacity # quad probing
-
-        while self._buckets[probe_idx] is not None: 
-            probe_idx = (idx + (j * j)) % self._capacity
-            if self._buckets[probe_idx] is None: 
-                return
-            if self._buckets[probe_idx].key == key and self._buckets[probe_idx].is_tombstone is False:
-                return self._buckets[probe_idx].value
-            j += 1
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+
+        entry = self._find_entry(key, self._hash_function(key))
+        if entry is not None:
+            return entry.value
 
 
     def contains_key(self, key: str) -> bool:
@@ -185,29 +419,93 @@ class HashMap:
         Returns True if the given key is in the hash map,
         otherwise it returns False.
         """
-        value = self.get(key)
-        if value == None:
-            return False
-        else:
-            return True
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+
+        # keys stored with the value None are found too
+        return self._find_entry(key, self._hash_function(key)) is not None
 
 
     def remove(self, key: str) -> None:
         """
         Removes the given key and its associated value from the hash map.
         """
-        idx = self._hash_function(key) % self._capacity
-        j = 0
-        probe_idx = (idx + (j * j)) % self._capacity # quad probing
-
-        while self._buckets[probe_idx] is not None: 
-            probe_idx = (idx + (j * j)) % self._capacity 
-            if self._buckets[probe_idx] is None: 
-                return
-            if self._buckets[probe_idx].key == key and self._buckets[probe_idx].is_tombstone is False:
-                self._buckets[probe_idx].is_tombstone = True
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+
+        hash_code = self._hash_function(key)
+        entry = self._probe(self._buckets, self._capacity, key, hash_code)
+        if entry is not None:
+            self._tombstones += 1
+        elif self._old_buckets is not None:
+            # tombstones in the old bucket array go away with it
+            entry = self._probe(self._old_buckets, self._old_capacity, key, hash_code)
+            if entry is not None:
+                self._old_entries -= 1
+
+        if entry is not None:
+            entry.is_tombstone = True
+            self._size -= 1
+
+
+    def put_many(self, keys, values) -> None:
+        """
+        Puts every key/value pair from two equally long iterables (or NumPy arrays).
+        The table is sized once for the whole batch and all keys are hashed in one
+        pass, instead of paying put()'s load check and resize per pair.
+        """
+        keys, values = to_list(keys), to_list(values)
+        if len(keys) != len(values):
+            raise ValueError("put_many() needs as many values as keys")
+
+        self._finish_rehash()
+        needed = self._size + len(keys)
+        if (needed + self._tombstones) / self._capacity >= 0.5:
+            self.resize_table(2 * needed + 1)
+
+        buckets, capacity = self._buckets, self._capacity
+        hashes = [self._hash_function(key) for key in keys]
+        for key, value, hash_code in zip(keys, values, hashes):
+            entry = self._probe(buckets, capacity, key, hash_code)
+            if entry is not None:
+                entry.value = value
+            else:
+                self._place(HashEntry(key, value, hash_code))
+                self._size += 1
+
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys
+        (None for keys not in the hash map).
+        """
+        keys = to_list(keys)
+        self._finish_rehash()
+
+        buckets, capacity = self._buckets, self._capacity
+        hashes = [self._hash_function(key) for key in keys]
+        values = []
+        for key, hash_code in zip(keys, hashes):
+            entry = self._probe(buckets, capacity, key, hash_code)
+            values.append(entry.value if entry is not None else None)
+        return values
+
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the hash map.
+        """
+        keys = to_list(keys)
+        self._finish_rehash()
+
+        buckets, capacity = self._buckets, self._capacity
+        hashes = [self._hash_function(key) for key in keys]
+        for key, hash_code in zip(keys, hashes):
+            entry = self._probe(buckets, capacity, key, hash_code)
+            if entry is not None:
+                entry.is_tombstone = True
                 self._size -= 1
-            j += 1
+                self._tombstones += 1
 
    
     def clear(self) -> None:
@@ -215,10 +513,12 @@ class HashMap:
         Clears the contents of the hash map. It does not change the underlying hash
         table capacity.
         """
-        self._buckets = DynamicArray()
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        self._buckets = DynamicArray(length=self._capacity)
         self._size = 0 
+        self._tombstones = 0
+        self._longest_probe = 0
+        self._old_buckets = None
+        self._old_entries = 0
 
 
     def get_keys_and_values(self) -> DynamicArray:
@@ -227,44 +527,510 @@ class HashMap:
         stored in the hash map.
         """
         dynamic_array = DynamicArray()
+        dynamic_array.extend(self._iter_items())
+        return dynamic_array
 
-        for idx in range(self._capacity):
-            bucket = self._buckets[idx]
+
+    def _iter_items(self):
+        """
+        Yields the key/value pair of each live entry, straight from the buckets.
+        """
+        self._finish_rehash()
+        for bucket in self._buckets:
             if bucket is not None and bucket.is_tombstone is False:
-                key = bucket.key
-                value = bucket.value
-                dynamic_array.append((key, value))
+                yield bucket.key, bucket.value
 
-        return dynamic_array
+
+    def _iter_entries(self):
+        """
+        Yields the cached hash, key and value of each live entry.
+        """
+        self._finish_rehash()
+        for bucket in self._buckets:
+            if bucket is not None and bucket.is_tombstone is False:
+                yield bucket.hash, bucket.key, bucket.value
+
+
+    def keys(self) -> HashMapView:
+        """
+        Returns a lazy view of the keys in the hash map.
+        """
+        return HashMapView(self, 0)
+
+
+    def values(self) -> HashMapView:
+        """
+        Returns a lazy view of the values in the hash map.
+        """
+        return HashMapView(self, 1)
+
+
+    def items(self) -> HashMapView:
+        """
+        Returns a lazy view of the key/value pairs in the hash map.
+        """
+        return HashMapView(self)
+
+
+    def save(self, path: str) -> None:
+        """
+        Writes the hash map, cached hashes included, to a file in the compact
+        snapshot format of hash_map_frozen.
+        """
+        hash_map_frozen.save(self, path)
+
+
+    @staticmethod
+    def load(path: str) -> hash_map_frozen.FrozenHashMap:
+        """
+        Opens a file written by save() as a read-only FrozenHashMap, which
+        memory-maps the file and looks keys up in it without rebuilding the map.
+        """
+        return hash_map_frozen.load(path)
 
 
     def __iter__(self):
         """
-        Lets the hash map iterate across itself.
+        Lets the hash map iterate across itself, yielding each live HashEntry.
+        Every call returns a new generator, so iterations can be nested.
         """
-        self._index = 0
-        return self
+        self._finish_rehash()
+        for bucket in self._buckets:
+            if bucket is not None and bucket.is_tombstone is False:
+                yield bucket
+
 
+class FlatHashMap(HashMap):
+    """
+    Open Addressing HashMap with a struct-of-arrays layout.
+    Instead of one HashEntry per slot, each slot is spread over parallel
+    flat arrays: cached hashes, keys, values and a one-byte slot state
+    (empty / live / tombstone). Uses the same quadratic probing as HashMap.
+    """
 
-    def __next__(self):
+    _max_load = 0.5  # occupancy (live + tombstones) that triggers a resize
+
+    def __init__(self, capacity: int, function) -> None:
         """
-        Returns the next item in the hash map, based on the current location of theiterator.
+        Initialize new FlatHashMap that uses
+        quadratic probing for collision resolution
         """
-        try: 
-            while self._buckets[self._index] is None or self._buckets[self._index].is_tombstone: 
-                self._index += 1
-            if self._buckets[self._index] is not None:
-                value = self._buckets[self._index]
-        except DynamicArrayException:
-            raise StopIteration
-        
-        self._index += 1
+        # capacity must be a prime number
+        self._capacity = PrimeCapacity.round_up(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._old_entries = 0  # never resizes incrementally
+        self._old_buckets = None
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                entry = None
+            else:
+                tombstone = self._states[i] == _TOMBSTONE
+                entry = f"K: {self._keys[i]} V: {self._values[i]} TS: {tombstone}"
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the slot arrays with empty arrays of the given capacity.
+        """
+        self._states = bytearray(capacity)
+        self._hashes = array('Q', [0]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._tombstones = 0
+        self._longest_probe = 0
+
+
+    def _find_slot(self, key: str, hash_code: int) -> int:
+        """
+        Returns the index of the live slot holding the given key,
+        or -1 if the key is not in the hash map.
+        """
+        capacity = self._capacity
+        states, hashes, keys = self._states, self._hashes, self._keys
+        idx = hash_code % capacity
+        probe_idx = idx
+        j = 0
+
+        while states[probe_idx] != _EMPTY and j < capacity:
+            if (states[probe_idx] == _LIVE and hashes[probe_idx] == hash_code
+                    and keys[probe_idx] == key):
+                return probe_idx
+            j += 1
+            probe_idx = (idx + (j * j)) % capacity  # quad probing
+
+        return -1
+
+
+    def _insert_new(self, key: str, value: object, hash_code: int) -> None:
+        """
+        Stores a key that is known not to be in the hash map
+        in the first free (empty or tombstone) slot of its probe sequence.
+        """
+        capacity = self._capacity
+        states = self._states
+        idx = hash_code % capacity
+        probe_idx = idx
+        j = 0
+
+        while states[probe_idx] == _LIVE:
+            j += 1
+            probe_idx = (idx + (j * j)) % capacity  # quad probing
+
+        if states[probe_idx] == _TOMBSTONE:
+            self._tombstones -= 1
+        if j >= self._longest_probe:
+            self._longest_probe = j + 1
+        states[probe_idx] = _LIVE
+        self._hashes[probe_idx] = hash_code
+        self._keys[probe_idx] = key
+        self._values[probe_idx] = value
+        self._size += 1
+
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key already exists,
+        its value is replaced by the new value. If the key doesn't exist,
+        a new key/value pair is added.
+        """
+        self._make_room()
+
+        hash_code = self._hash_function(key) & _HASH_MASK
+        slot = self._find_slot(key, hash_code)
+        if slot >= 0:
+            self._values[slot] = value
+        else:
+            self._insert_new(key, value, hash_code)
+
+
+    def _make_room(self) -> None:
+        """
+        Doubles the capacity, or clears the tombstones if they outnumber the
+        live entries, before a key is added if the load has reached _max_load.
+        """
+        # tombstones lengthen probe sequences just like live entries do
+        if (self._size + self._tombstones) / self._capacity >= self._max_load:
+            if self._tombstones > self._size:
+                self.resize_table(self._capacity)  # same-capacity compaction
+            else:
+                self.resize_table(self._capacity * 2)
+
+
+    def _upsert(self, key: str, fn, default: object) -> object:
+        """
+        Does the work of setdefault(), update_with() and increment() with a
+        single slot lookup (see HashMap._upsert).
+        """
+        self._make_room()
+
+        hash_code = self._hash_function(key) & _HASH_MASK
+        slot = self._find_slot(key, hash_code)
+        if slot >= 0:
+            if fn is not None:
+                self._values[slot] = fn(self._values[slot])
+            return self._values[slot]
+
+        value = default if fn is None else fn(default)
+        self._insert_new(key, value, hash_code)
         return value
 
 
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+        """
+        return self._capacity - self._size
+
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table. Entries are placed
+        using their cached hashes, so the hash function is not called again.
+        """
+        if new_capacity < self._size:
+            return
+
+        capacity = PrimeCapacity.round_up(new_capacity)
+
+        # keep growing the same way put() would while re-inserting
+        while self._size and (self._size - 1) / capacity >= self._max_load:
+            capacity = PrimeCapacity.round_up(capacity * 2)
+
+        old_states, old_hashes = self._states, self._hashes
+        old_keys, old_values = self._keys, self._values
+        old_capacity = self._capacity
+
+        self._capacity = capacity
+        self._allocate(capacity)
+        self._size = 0  # reset before putting in old values
+
+        for idx in range(old_capacity):
+            if old_states[idx] == _LIVE:
+                self._insert_new(old_keys[idx], old_values[idx], old_hashes[idx])
+
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, the method returns None.
+        """
+        slot = self._find_slot(key, self._hash_function(key) & _HASH_MASK)
+        if slot >= 0:
+            return self._values[slot]
+
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map,
+        otherwise it returns False.
+        """
+        return self._find_slot(key, self._hash_function(key) & _HASH_MASK) >= 0
+
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        """
+        slot = self._find_slot(key, self._hash_function(key) & _HASH_MASK)
+        if slot >= 0:
+            self._remove_slot(slot)
+
+
+    def _remove_slot(self, slot: int) -> None:
+        """
+        Removes the entry in the given live slot, leaving a tombstone.
+        """
+        self._states[slot] = _TOMBSTONE
+        self._keys[slot] = None  # drop references held by the tombstone
+        self._values[slot] = None
+        self._size -= 1
+        self._tombstones += 1
+
+
+    def put_many(self, keys, values) -> None:
+        """
+        Puts every key/value pair from two equally long iterables (or NumPy arrays).
+        The table is sized once for the whole batch and all keys are hashed in one
+        pass, instead of paying put()'s load check and resize per pair.
+        """
+        keys, values = to_list(keys), to_list(values)
+        if len(keys) != len(values):
+            raise ValueError("put_many() needs as many values as keys")
+
+        needed = self._size + len(keys)
+        if (needed + self._tombstones) / self._capacity >= self._max_load:
+            self.resize_table(int(needed / self._max_load) + 1)
+
+        hashes = [self._hash_function(key) & _HASH_MASK for key in keys]
+        for key, value, hash_code in zip(keys, values, hashes):
+            slot = self._find_slot(key, hash_code)
+            if slot >= 0:
+                self._values[slot] = value
+            else:
+                self._insert_new(key, value, hash_code)
+
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys
+        (None for keys not in the hash map).
+        """
+        keys = to_list(keys)
+        hashes = [self._hash_function(key) & _HASH_MASK for key in keys]
+        values = []
+        for key, hash_code in zip(keys, hashes):
+            slot = self._find_slot(key, hash_code)
+            values.append(self._values[slot] if slot >= 0 else None)
+        return values
+
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the hash map.
+        """
+        keys = to_list(keys)
+        hashes = [self._hash_function(key) & _HASH_MASK for key in keys]
+        for key, hash_code in zip(keys, hashes):
+            slot = self._find_slot(key, hash_code)
+            if slot >= 0:
+                self._remove_slot(slot)
+
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the underlying hash
+        table capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+
+
+    def _iter_items(self):
+        """
+        Yields the key/value pair of each live slot, straight from the slot arrays.
+        """
+        states, keys, values = self._states, self._keys, self._values
+        for idx in range(self._capacity):
+            if states[idx] == _LIVE:
+                yield keys[idx], values[idx]
+
+
+    def _iter_entries(self):
+        """
+        Yields the cached hash, key and value of each live slot.
+        """
+        states, hashes = self._states, self._hashes
+        keys, values = self._keys, self._values
+        for idx in range(self._capacity):
+            if states[idx] == _LIVE:
+                yield hashes[idx], keys[idx], values[idx]
+
+
+    def __iter__(self):
+        """
+        Lets the hash map iterate across itself, yielding a HashEntry
+        for each live slot.
+        """
+        for idx in range(self._capacity):
+            if self._states[idx] == _LIVE:
+                yield HashEntry(self._keys[idx], self._values[idx])
+
+
+class RobinHoodHashMap(FlatHashMap):
+    """
+    Open Addressing HashMap using Robin Hood hashing over linear probing.
+    Each slot records its entry's probe distance (how far it sits from its home
+    bucket); inserts displace entries that are closer to home than the incoming
+    one, lookups stop as soon as they pass the point where the key would have
+    been placed, and removals shift the following entries back instead of
+    leaving tombstones. This keeps probe sequences short at high load factors.
+    """
+
+    def __init__(self, capacity: int, function, load_factor: float = 0.9) -> None:
+        """
+        Initialize new RobinHoodHashMap that grows once the
+        given load factor is reached
+        """
+        if not 0 < load_factor < 1:
+            raise ValueError("load_factor must be between 0 and 1")
+        self._max_load = load_factor
+        super().__init__(capacity, function)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the slot arrays, including the probe distances,
+        with empty arrays of the given capacity.
+        """
+        super()._allocate(capacity)
+        self._dists = array('L', [0]) * capacity
+
+
+    def _find_slot(self, key: str, hash_code: int) -> int:
+        """
+        Returns the index of the slot holding the given key,
+        or -1 if the key is not in the hash map.
+        """
+        capacity = self._capacity
+        states, dists = self._states, self._dists
+        hashes, keys = self._hashes, self._keys
+        probe_idx = hash_code % capacity
+        dist = 0
+
+        # an entry closer to its home than we are to ours means the key is absent
+        while states[probe_idx] == _LIVE and dists[probe_idx] >= dist:
+            if hashes[probe_idx] == hash_code and keys[probe_idx] == key:
+                return probe_idx
+            dist += 1
+            probe_idx += 1
+            if probe_idx == capacity:
+                probe_idx = 0
+
+        return -1
+
+
+    def _insert_new(self, key: str, value: object, hash_code: int) -> None:
+        """
+        Stores a key that is known not to be in the hash map, swapping it with
+        any entry on the way that sits closer to its home bucket.
+        """
+        capacity = self._capacity
+        states, dists = self._states, self._dists
+        hashes, keys, values = self._hashes, self._keys, self._values
+        probe_idx = hash_code % capacity
+        dist = 0
+
+        while states[probe_idx] == _LIVE:
+            if dists[probe_idx] < dist:
+                if dist >= self._longest_probe:
+                    self._longest_probe = dist + 1
+                # take the slot and carry on inserting the displaced entry
+                hash_code, hashes[probe_idx] = hashes[probe_idx], hash_code
+                key, keys[probe_idx] = keys[probe_idx], key
+                value, values[probe_idx] = values[probe_idx], value
+                dist, dists[probe_idx] = dists[probe_idx], dist
+            dist += 1
+            probe_idx += 1
+            if probe_idx == capacity:
+                probe_idx = 0
+
+        states[probe_idx] = _LIVE
+        hashes[probe_idx] = hash_code
+        keys[probe_idx] = key
+        values[probe_idx] = value
+        dists[probe_idx] = dist
+        self._size += 1
+        if dist >= self._longest_probe:
+            self._longest_probe = dist + 1
+
+
+    def _make_room(self) -> None:
+        """
+        Doubles the capacity before a key is added if the load factor has
+        reached _max_load (removals leave no tombstones to count).
+        """
+        if self.table_load() >= self._max_load:
+            self.resize_table(self._capacity * 2)
+
+
+    def _remove_slot(self, slot: int) -> None:
+        """
+        Removes the entry in the given live slot, shifting the rest of its
+        cluster back by one slot instead of leaving a tombstone.
+        """
+        capacity = self._capacity
+        states, dists = self._states, self._dists
+        hashes, keys, values = self._hashes, self._keys, self._values
+        next_idx = slot + 1 if slot + 1 < capacity else 0
+
+        # entries that aren't in their home bucket move one step closer to it
+        while states[next_idx] == _LIVE and dists[next_idx] > 0:
+            hashes[slot] = hashes[next_idx]
+            keys[slot] = keys[next_idx]
+            values[slot] = values[next_idx]
+            dists[slot] = dists[next_idx] - 1
+            slot = next_idx
+            next_idx = slot + 1 if slot + 1 < capacity else 0
+
+        states[slot] = _EMPTY
+        keys[slot] = None
+        values[slot] = None
+        self._size -= 1
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
+    pass
 
 
     # ###Michelle's sandbox
@@ -0,0 +1,338 @@
+# Description: Partitioned HashMap spread over shard processes. Each shard is a process
+#              running an SC HashMap; keys are routed to shards by a consistent-hash
+#              ring, so adding or removing a shard only moves the keys of the ring arcs
+#              it gains or loses. Requests are grouped per shard and sent over pipes,
+#              one message per shard for a whole batch, and all shards of a batch work
+#              at the same time.
+
+from bisect import bisect_left
+from multiprocessing import Pipe, Process
+
+from a6_include import DynamicArray, mix_hash, hash_function_1, hash_function_fnv1a
+from hash_map_sc import HashMap
+
+_REPLICAS = 64  # ring points per shard; more points spread the keys more evenly
+
+
+class HashRing:
+    """
+    Consistent-hash ring of 64-bit points. Each shard owns `replicas` points
+    and a key belongs to the shard owning the first point at or after its
+    hash, wrapping around. The hash function must give the same hashes in
+    every process (hash_function_builtin doesn't for str keys).
+    """
+
+    def __init__(self, function=hash_function_fnv1a, replicas: int = _REPLICAS) -> None:
+        """Initialize an empty ring."""
+        self._function = function
+        self._replicas = replicas
+        self._points = []  # sorted
+        self._owners = []  # shard owning each point
+
+    def _hash(self, key: object) -> int:
+        """Return the key's position on the ring."""
+        return mix_hash(self._function(key))
+
+    def add(self, shard: int) -> None:
+        """Add the given shard's points to the ring."""
+        for replica in range(self._replicas):
+            point = self._hash(f"shard {shard} replica {replica}")
+            idx = bisect_left(self._points, point)
+            self._points.insert(idx, point)
+            self._owners.insert(idx, shard)
+
+    def remove(self, shard: int) -> None:
+        """Remove the given shard's points from the ring."""
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != shard]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def lookup(self, key: object) -> int:
+        """Return the shard the given key belongs to."""
+        idx = bisect_left(self._points, self._hash(key))
+        return self._owners[idx if idx < len(self._points) else 0]
+
+
+# ------------------ Shard process side  ------------------ #
+
+def _take(hash_map: HashMap, ring: HashRing, shard: int) -> list:
+    """
+    Removes the keys that the given ring assigns to another shard and returns
+    them as (key, value) pairs.
+    """
+    moved = [(key, value) for key, value in hash_map.items() if ring.lookup(key) != shard]
+    hash_map.remove_many([key for key, _ in moved])
+    return moved
+
+
+_OPERATIONS = {
+    'put_many': HashMap.put_many,
+    'get_many': HashMap.get_many,
+    'contains_many': lambda hash_map, keys: [hash_map.contains_key(key) for key in keys],
+    'remove_many': HashMap.remove_many,
+    'items': lambda hash_map: list(hash_map.items()),
+    'size': HashMap.get_size,
+    'clear': HashMap.clear,
+    'take': _take,
+}
+
+
+def _serve(connection, capacity: int, function) -> None:
+    """
+    Shard process: runs the requests received on the connection against its own
+    HashMap until it is told to close. Each (operation, args) request is answered
+    with (True, result), or (False, exception) if the operation raised.
+    """
+    hash_map = HashMap(capacity, function)
+    while True:
+        operation, args = connection.recv()
+        if operation == 'close':
+            connection.close()
+            return
+        try:
+            reply = (True, _OPERATIONS[operation](hash_map, *args))
+        except Exception as exception:
+            reply = (False, exception)
+        connection.send(reply)
+
+
+# ------------------ Client side  ------------------ #
+
+class PartitionedHashMap:
+    def __init__(self, shards: int = 4, capacity: int = 11, function=hash_function_1,
+                 ring_function=hash_function_fnv1a, replicas: int = _REPLICAS) -> None:
+        """
+        Initialize a map over the given number of shard processes. capacity and
+        function configure each shard's HashMap; ring_function and replicas
+        configure the HashRing that routes keys to shards.
+        """
+        if shards < 1:
+            raise ValueError("PartitionedHashMap needs at least one shard")
+        self._capacity = capacity
+        self._function = function
+        self._ring = HashRing(ring_function, replicas)
+        self._shards = {}  # shard id -> (process, connection)
+        self._next_shard = 0
+        for _ in range(shards):
+            self._ring.add(self._start_shard())
+
+    def __enter__(self) -> "PartitionedHashMap":
+        """Return the map, which is closed when the with block ends."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop the shard processes."""
+        self.close()
+
+    def get_shards(self) -> list:
+        """
+        Return the ids of the shards
+        """
+        return list(self._shards)
+
+    def _start_shard(self) -> int:
+        """
+        Starts a shard process (not yet on the ring) and returns its id.
+        """
+        shard = self._next_shard
+        self._next_shard += 1
+        connection, shard_connection = Pipe()
+        process = Process(target=_serve, args=(shard_connection, self._capacity, self._function),
+                          daemon=True)
+        process.start()
+        shard_connection.close()
+        self._shards[shard] = (process, connection)
+        return shard
+
+    def _stop_shard(self, shard: int) -> None:
+        """
+        Tells a shard process to exit and waits for it.
+        """
+        process, connection = self._shards.pop(shard)
+        connection.send(('close', None))
+        connection.close()
+        process.join()
+
+    def close(self) -> None:
+        """
+        Stops every shard process. The map can't be used afterwards.
+        """
+        for shard in list(self._shards):
+            self._stop_shard(shard)
+
+    # ------------------------------------------------------------------ #
+
+    def _call(self, requests: dict) -> dict:
+        """
+        Sends each shard its (operation, args) request, then collects every reply,
+        so the shards work at the same time. Returns the results by shard id and
+        raises the first shard's exception, if any, once all have replied.
+        """
+        for shard, request in requests.items():
+            self._shards[shard][1].send(request)
+
+        results, error = {}, None
+        for shard in requests:
+            ok, result = self._shards[shard][1].recv()
+            if ok:
+                results[shard] = result
+            elif error is None:
+                error = result
+        if error is not None:
+            raise error
+        return results
+
+
+    def _route(self, keys: list) -> dict:
+        """
+        Returns the positions of the given keys grouped by the shard they belong to.
+        """
+        groups = {}
+        lookup = self._ring.lookup
+        for pos, key in enumerate(keys):
+            shard = lookup(key)
+            if shard in groups:
+                groups[shard].append(pos)
+            else:
+                groups[shard] = [pos]
+        return groups
+
+
+    def put_many(self, keys, values) -> None:
+        """
+        Puts every key/value pair from two equally long iterables, sending each
+        shard its pairs in one message.
+        """
+        keys, values = list(keys), list(values)
+        if len(keys) != len(values):
+            raise ValueError("put_many() needs as many values as keys")
+        self._call({shard: ('put_many', ([keys[pos] for pos in positions],
+                                         [values[pos] for pos in positions]))
+                    for shard, positions in self._route(keys).items()})
+
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys
+        (None for keys not in the hash map).
+        """
+        keys = list(keys)
+        groups = self._route(keys)
+        results = self._call({shard: ('get_many', ([keys[pos] for pos in positions],))
+                              for shard, positions in groups.items()})
+        values = [None] * len(keys)
+        for shard, positions in groups.items():
+            for pos, value in zip(positions, results[shard]):
+                values[pos] = value
+        return values
+
+
+    def contains_many(self, keys) -> list:
+        """
+        Returns a list telling, for each of the given keys, whether it is in the hash map.
+        """
+        keys = list(keys)
+        groups = self._route(keys)
+        results = self._call({shard: ('contains_many', ([keys[pos] for pos in positions],))
+                              for shard, positions in groups.items()})
+        found = [False] * len(keys)
+        for shard, positions in groups.items():
+            for pos, value in zip(positions, results[shard]):
+                found[pos] = value
+        return found
+
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the hash map.
+        """
+        keys = list(keys)
+        self._call({shard: ('remove_many', ([keys[pos] for pos in positions],))
+                    for shard, positions in self._route(keys).items()})
+
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key already exists,
+        its value is replaced by the new value. If the key doesn't exist,
+        a new key/value pair is added.
+        """
+        self.put_many([key], [value])
+
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in the hash
+        map, the method returns None.
+        """
+        return self.get_many([key])[0]
+
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it returns False.
+        """
+        return self.contains_many([key])[0]
+
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        """
+        self.remove_many([key])
+
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(self._call({shard: ('size', ()) for shard in self._shards}).values())
+
+
+    def clear(self) -> None:
+        """
+        Clears the contents of every shard.
+        """
+        self._call({shard: ('clear', ()) for shard in self._shards})
+
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+        """
+        dynamic_array = DynamicArray()
+        for items in self._call({shard: ('items', ()) for shard in self._shards}).values():
+            dynamic_array.extend(items)
+        return dynamic_array
+
+
+    def add_shard(self) -> int:
+        """
+        Starts a new shard and returns its id. Only the keys on the ring arcs the new
+        shard takes over move: each old shard hands over the keys the new ring
+        assigns elsewhere, which all belong to the new shard.
+        """
+        old_shards = list(self._shards)
+        shard = self._start_shard()
+        self._ring.add(shard)
+
+        moved = self._call({old: ('take', (self._ring, old)) for old in old_shards})
+        pairs = [pair for items in moved.values() for pair in items]
+        self.put_many([key for key, _ in pairs], [value for _, value in pairs])
+        return shard
+
+
+    def remove_shard(self, shard: int) -> None:
+        """
+        Stops the given shard after handing its keys to the shards that now own them.
+        """
+        if shard not in self._shards:
+            raise KeyError(shard)
+        if len(self._shards) == 1:
+            raise ValueError("can't remove the last shard")
+
+        self._ring.remove(shard)
+        pairs = self._call({shard: ('items', ())})[shard]
+        self._stop_shard(shard)
+        self.put_many([key for key, _ in pairs], [value for _, value in pairs])
@@ -5,29 +5,507 @@
 # Sources Cited: Skeleton code owned and provided by the professors at Oregon State University
 
 
-from a6_include import (DynamicArray, LinkedList,
+from array import array
+from bisect import bisect_left, bisect_right
+
+from a6_include import (DynamicArray, HashMapView, LinkedList, SLNode, to_list,
                         hash_function_1, hash_function_2)
+from capacity_policy import PrimeCapacity, PowerOfTwoCapacity
+import hash_map_frozen
+
+# number of old buckets migrated by each operation during an incremental resize
+_REHASH_STEP = 8
+
+# a bucket's LinkedList becomes a SortedChain above this many keys, and turns
+# back into a LinkedList at the lower threshold (the gap avoids flip-flopping)
+_TREEIFY_THRESHOLD = 8
+_UNTREEIFY_THRESHOLD = 6
+
+# returned by bucket lookups for a missing key, since None is a valid value
+_MISSING = object()
+
+
+class SortedChain:
+    """
+    Bucket for many colliding keys: nodes kept sorted by (hash, key) and
+    found by binary search, so lookups stay O(log n) however long the chain.
+    Keys with equal hashes that can't be ordered against each other are
+    kept unsorted and scanned. Supports the same methods as LinkedList:
+    insert, remove, contains, length, iterator
+    """
+
+    __slots__ = ('_hashes', '_keys', '_nodes', '_keys_sorted')
+
+    def __init__(self, nodes=()) -> None:
+        """
+        Initialize the chain with the given nodes (which must have cached
+        hashes and distinct keys).
+        """
+        nodes = list(nodes)
+        for node in nodes:
+            node.next = None  # so a removed node isn't kept alive by its old predecessor
+        self._keys_sorted = True
+        try:
+            nodes.sort(key=lambda node: (node.hash, node.key))
+        except TypeError:
+            nodes.sort(key=lambda node: node.hash)
+            self._keys_sorted = False
+
+        self._hashes = [node.hash for node in nodes]
+        self._keys = [node.key for node in nodes]
+        self._nodes = nodes
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'Sorted [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes, in (hash, key) order."""
+        return iter(self._nodes)
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Return the position of the node with the given key, or -1.
+        """
+        lo = bisect_left(self._hashes, hash)
+        hi = bisect_right(self._hashes, hash, lo)
+        if self._keys_sorted:
+            try:
+                pos = bisect_left(self._keys, key, lo, hi)
+                return pos if pos < hi and self._keys[pos] == key else -1
+            except TypeError:
+                pass  # a key of another type; fall back to scanning
+
+        for pos in range(lo, hi):
+            if self._keys[pos] == key:
+                return pos
+        return -1
+
+    def insert(self, key: str, value: object, hash: int) -> None:
+        """Insert a new node for a key not in the chain."""
+        lo = bisect_left(self._hashes, hash)
+        hi = bisect_right(self._hashes, hash, lo)
+        pos = hi
+        if self._keys_sorted:
+            try:
+                pos = bisect_right(self._keys, key, lo, hi)
+            except TypeError:
+                self._keys_sorted = False
+
+        self._hashes.insert(pos, hash)
+        self._keys.insert(pos, key)
+        self._nodes.insert(pos, SLNode(key, value, None, hash))
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove the node with the given key.
+        Return True if removal was successful, False otherwise.
+        """
+        pos = self._find(key, hash)
+        if pos < 0:
+            return False
+        del self._hashes[pos]
+        del self._keys[pos]
+        del self._nodes[pos]
+        return True
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        pos = self._find(key, hash)
+        if pos >= 0:
+            return self._nodes[pos]
+
+    def length(self) -> int:
+        """Return the number of nodes in the chain."""
+        return len(self._nodes)
+
+
+# Buckets are allocated lazily: an empty bucket is None, a bucket with one
+# key holds its SLNode directly, buckets with more keys get a LinkedList and
+# buckets with many keys a SortedChain.
+
+def _find_node(bucket, key: str, hash_code: int) -> SLNode:
+    """
+    Returns the node holding the given key in a bucket, or None.
+    """
+    if bucket is None:
+        return None
+    if isinstance(bucket, SLNode):
+        if bucket.hash == hash_code and bucket.key == key:
+            return bucket
+        return None
+    return bucket.contains(key, hash_code)
+
+
+def _add_node(buckets: DynamicArray, idx: int, node: SLNode) -> int:
+    """
+    Adds a node whose key is not in the bucket at buckets[idx]. An empty
+    bucket stores the node itself; a second key turns it into a LinkedList
+    and going over the treeify threshold into a SortedChain.
+    Returns the new number of keys in the bucket.
+    """
+    bucket = buckets[idx]
+    if bucket is None:
+        node.next = None
+        buckets[idx] = node
+        return 1
+    if isinstance(bucket, SLNode):
+        chain = LinkedList()
+        chain.insert(bucket.key, bucket.value, bucket.hash)
+        chain.insert(node.key, node.value, node.hash)
+        buckets[idx] = chain
+        return 2
+
+    bucket.insert(node.key, node.value, node.hash)
+    length = bucket.length()
+    if length > _TREEIFY_THRESHOLD and isinstance(bucket, LinkedList):
+        buckets[idx] = SortedChain(bucket)
+    return length
+
+
+def _remove_node(buckets: DynamicArray, idx: int, key: str, hash_code: int) -> int:
+    """
+    Removes the given key from the bucket at buckets[idx], turning a SortedChain
+    that shrinks to the untreeify threshold back into a LinkedList, and a list
+    left with one node back into that node. Returns the number of keys the
+    bucket had before, or 0 if the key was not found.
+    """
+    bucket = buckets[idx]
+    if bucket is None:
+        return 0
+    if isinstance(bucket, SLNode):
+        if bucket.hash == hash_code and bucket.key == key:
+            buckets[idx] = None
+            return 1
+        return 0
+
+    if not bucket.remove(key, hash_code):
+        return 0
+    length = bucket.length()
+    if isinstance(bucket, SortedChain):
+        if length <= _UNTREEIFY_THRESHOLD:
+            chain = LinkedList()
+            for node in bucket:
+                chain.insert(node.key, node.value, node.hash)
+            buckets[idx] = chain
+    elif length == 1:
+        buckets[idx] = next(iter(bucket))
+    return length + 1
+
+
+def _nodes(bucket):
+    """
+    Returns an iterable over the nodes of a bucket.
+    """
+    if bucket is None:
+        return ()
+    if isinstance(bucket, SLNode):
+        return (bucket,)
+    return bucket
+
+
+# With array_chains=True, the bucket array is an ArrayChains instead of a
+# DynamicArray: the entries of all buckets live in one set of flat parallel
+# arrays and a bucket only holds the index of its first entry. The helpers
+# below take a bucket array of either kind and an index into it.
+
+_NO_ENTRY = -1  # end of an array chain, or an empty bucket
+
+
+class ChainEntries:
+    """
+    Entry storage shared by the buckets of an ArrayChains: parallel arrays of
+    cached hashes, keys, values and the index of the next entry in the same
+    bucket. Hashes are stored unboxed while they fit in 64 unsigned bits (all
+    of a6_include's hash functions do); the first one that doesn't turns the
+    hash array into a list. A removed entry goes on a free list, linked through
+    the same next array, and is reused by the next add.
+    """
+
+    __slots__ = ('hashes', 'keys', 'values', 'next', 'free')
+
+    def __init__(self) -> None:
+        """Initialize storage with no entries."""
+        self.hashes = array('Q')
+        self.keys = []
+        self.values = []
+        self.next = array('q')
+        self.free = _NO_ENTRY
+
+    def add(self, hash: int, key: object, value: object, next: int) -> int:
+        """Store a new entry and return its index."""
+        i = self.free
+        if i == _NO_ENTRY:
+            i = len(self.keys)
+            self.keys.append(key)
+            self.values.append(value)
+            self.next.append(next)
+            self._set_hash(i, hash)
+        else:
+            self.free = self.next[i]
+            self.keys[i] = key
+            self.values[i] = value
+            self.next[i] = next
+            self._set_hash(i, hash)
+        return i
+
+    def _set_hash(self, i: int, hash: int) -> None:
+        """Store the hash of entry i, appending it for a new entry."""
+        try:
+            if i == len(self.hashes):
+                self.hashes.append(hash)
+            else:
+                self.hashes[i] = hash
+        except OverflowError:
+            self.hashes = list(self.hashes)
+            self._set_hash(i, hash)
+
+    def discard(self, i: int) -> None:
+        """Put entry i, already unlinked from its bucket, on the free list."""
+        self.keys[i] = _MISSING
+        self.values[i] = None
+        self.next[i] = self.free
+        self.free = i
+
+    def live(self):
+        """Return an iterator over the indices of the stored entries."""
+        keys = self.keys
+        return (i for i in range(len(keys)) if keys[i] is not _MISSING)
+
+
+class ArrayChains:
+    """
+    Bucket array for array_chains=True: one index per bucket to its first
+    entry in a ChainEntries, which an old and a new bucket array share during
+    a resize, so migrating a bucket only relinks its entries. A key costs no
+    node or list object. Like the DynamicArray it replaces, supports length()
+    and [] (giving a bucket's (key, value) pairs, or None if it is empty).
+    """
+
+    __slots__ = ('heads', 'entries')
+
+    def __init__(self, capacity: int, entries: ChainEntries) -> None:
+        """Initialize the given number of empty buckets over the given entries."""
+        self.heads = array('q', [_NO_ENTRY]) * capacity
+        self.entries = entries
+
+    def __getitem__(self, idx: int) -> list:
+        """Return the (key, value) pairs in a bucket, or None if it is empty."""
+        keys, values = self.entries.keys, self.entries.values
+        return [(keys[i], values[i]) for i in self.chain(idx)] or None
+
+    def length(self) -> int:
+        """Return the number of buckets."""
+        return len(self.heads)
+
+    def chain(self, idx: int):
+        """Yield the index of every entry in a bucket."""
+        next = self.entries.next
+        i = self.heads[idx]
+        while i != _NO_ENTRY:
+            yield i
+            i = next[i]
+
+    def find(self, idx: int, key: object, hash: int) -> tuple:
+        """
+        Return the index of the entry holding the key in a bucket (or -1), and
+        the bucket's number of entries if the key isn't in it.
+        """
+        entries = self.entries
+        hashes, keys, next = entries.hashes, entries.keys, entries.next
+        i = self.heads[idx]
+        length = 0
+        while i != _NO_ENTRY:
+            if hashes[i] == hash and keys[i] == key:
+                return i, 0
+            i = next[i]
+            length += 1
+        return _NO_ENTRY, length
+
+    def add(self, idx: int, key: object, value: object, hash: int) -> None:
+        """Add an entry for a key not in the bucket, at the front of its chain."""
+        self.heads[idx] = self.entries.add(hash, key, value, self.heads[idx])
+
+    def remove(self, idx: int, key: object, hash: int) -> int:
+        """
+        Remove the key's entry from a bucket. Return the number of entries the
+        bucket had before, or 0 if the key was not found.
+        """
+        entries = self.entries
+        hashes, keys, next = entries.hashes, entries.keys, entries.next
+        prev = _NO_ENTRY
+        i = self.heads[idx]
+        while i != _NO_ENTRY and not (hashes[i] == hash and keys[i] == key):
+            prev, i = i, next[i]
+        if i == _NO_ENTRY:
+            return 0
+
+        if prev == _NO_ENTRY:
+            self.heads[idx] = next[i]
+        else:
+            next[prev] = next[i]
+        entries.discard(i)
+        return sum(1 for _ in self.chain(idx)) + 1
+
+    def move(self, idx: int, target: "ArrayChains", capacity: int, added) -> None:
+        """
+        Relinks every entry of a bucket into the given bucket array of the given
+        capacity, using the cached hashes, and calls added() with the new length
+        of each bucket that grows.
+        """
+        entries = self.entries
+        hashes, next, heads = entries.hashes, entries.next, target.heads
+        i = self.heads[idx]
+        self.heads[idx] = _NO_ENTRY
+        while i != _NO_ENTRY:
+            following = next[i]
+            new_idx = hashes[i] % capacity
+            next[i] = heads[new_idx]
+            heads[new_idx] = i
+            added(sum(1 for _ in target.chain(new_idx)))
+            i = following
+
+
+def _bucket_get(buckets, idx: int, key: str, hash_code: int, default: object = None) -> object:
+    """
+    Returns the value stored for the given key in the bucket at buckets[idx],
+    or default if the key is not in it.
+    """
+    if buckets.__class__ is ArrayChains:
+        i, _ = buckets.find(idx, key, hash_code)
+        return default if i == _NO_ENTRY else buckets.entries.values[i]
+
+    node = _find_node(buckets[idx], key, hash_code)
+    return default if node is None else node.value
+
+
+def _bucket_put(buckets, idx: int, key: str, value: object, hash_code: int) -> int:
+    """
+    Stores the key/value pair in the bucket at buckets[idx], replacing the value
+    if the key is already there. Returns the new number of keys in the bucket
+    if the key was added, or 0 if its value was replaced.
+    """
+    if buckets.__class__ is ArrayChains:
+        i, length = buckets.find(idx, key, hash_code)
+        if i != _NO_ENTRY:
+            buckets.entries.values[i] = value
+            return 0
+        buckets.add(idx, key, value, hash_code)
+        return length + 1
+
+    bucket = buckets[idx]
+    if bucket is not None:
+        node = _find_node(bucket, key, hash_code)
+        if node is not None:
+            node.value = value
+            return 0
+    return _add_node(buckets, idx, SLNode(key, value, None, hash_code))
+
+
+def _bucket_update(buckets, idx: int, key: str, fn, default: object, hash_code: int) -> tuple:
+    """
+    Replaces the value stored for the given key in the bucket at buckets[idx] with
+    fn(value), or adds the key with the value fn(default) if it is not there; with
+    fn=None, an existing value is kept and default is added. The bucket is walked
+    once. Returns the key's value and, like _bucket_put, the new number of keys
+    in the bucket if the key was added, or 0.
+    """
+    if buckets.__class__ is ArrayChains:
+        i, length = buckets.find(idx, key, hash_code)
+        if i != _NO_ENTRY:
+            values = buckets.entries.values
+            if fn is not None:
+                values[i] = fn(values[i])
+            return values[i], 0
+        value = default if fn is None else fn(default)
+        buckets.add(idx, key, value, hash_code)
+        return value, length + 1
+
+    bucket = buckets[idx]
+    if bucket is not None:
+        node = _find_node(bucket, key, hash_code)
+        if node is not None:
+            if fn is not None:
+                node.value = fn(node.value)
+            return node.value, 0
+
+    value = default if fn is None else fn(default)
+    return value, _add_node(buckets, idx, SLNode(key, value, None, hash_code))
+
+
+def _bucket_remove(buckets, idx: int, key: str, hash_code: int) -> int:
+    """
+    Removes the given key from the bucket at buckets[idx]. Returns the number
+    of keys the bucket had before, or 0 if the key was not found.
+    """
+    if buckets.__class__ is ArrayChains:
+        return buckets.remove(idx, key, hash_code)
+    return _remove_node(buckets, idx, key, hash_code)
+
+
+def _bucket_hashes(buckets, idx: int):
+    """
+    Returns an iterable over the cached hashes of the keys in the bucket at buckets[idx].
+    """
+    if buckets.__class__ is ArrayChains:
+        hashes = buckets.entries.hashes
+        return (hashes[i] for i in buckets.chain(idx))
+    return (node.hash for node in _nodes(buckets[idx]))
+
+
+def _move_bucket(old_buckets, idx: int, buckets, capacity: int, added) -> None:
+    """
+    Moves every entry of the bucket at old_buckets[idx] to the given new bucket
+    array, using the cached hashes, and calls added() with the new length of
+    each bucket that grows. Linked nodes landing in an empty bucket are moved
+    rather than copied.
+    """
+    if old_buckets.__class__ is ArrayChains:
+        old_buckets.move(idx, buckets, capacity, added)
+        return
+
+    for node in _nodes(old_buckets[idx]):
+        added(_add_node(buckets, node.hash % capacity, node))
+    old_buckets[idx] = None
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental: bool = False,
+                 power_of_two: bool = False,
+                 array_chains: bool = False) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        With incremental=True, growing the table keeps the old bucket array
+        around and migrates a few buckets per operation instead of
+        rehashing every link inside a single put().
+        Buckets are allocated on their first insert.
+        With power_of_two=True, the capacity is a power of two instead of a
+        prime and the hash function's results are finalized with mix_hash.
+        With array_chains=True, the entries are kept in flat parallel arrays
+        chained by index (see ArrayChains) instead of SLNodes, and buckets are
+        never treeified.
         """
-        self._buckets = DynamicArray()
+        self._policy = PowerOfTwoCapacity if power_of_two else PrimeCapacity
+        self._array_chains = array_chains
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        # capacity must be a prime number (or a power of two)
+        self._capacity = self._policy.round_up(capacity)
+        self._buckets = self._new_buckets(self._capacity)
+        self._reset_chain_lengths()
 
-        self._hash_function = function
+        # cached hashes are finalized ones, so rehashing needs no extra work
+        self._hash_function = self._policy.hash_function(function)
         self._size = 0
 
+        self._incremental = incremental
+        self._old_buckets = None  # bucket array being migrated from, if any
+        self._old_capacity = 0
+        self._rehash_idx = 0  # next old bucket to migrate
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -93,33 +571,200 @@ class HashMap:
         its value is replaced by the new value. If the key doesn't exist, 
         a new key/value pair is added.
         """
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+        self._make_room()
+
+        hash_code = self._hash_function(key)
+        buckets, idx = self._bucket_for(hash_code)
+        # updates the value if the key exists, adds a new key/value if the key DNE
+        length = _bucket_put(buckets, idx, key, value, hash_code)
+        if length:
+            self._size += 1
+            if buckets is self._buckets:
+                self._chain_added(length)
+
+
+    def _make_room(self) -> None:
+        """
+        Doubles the capacity (at once, or by starting an incremental resize)
+        before a key is added, if the load factor has reached 1.
+        """
         if self.table_load() >= 1:
             new_capacity = self._capacity * 2 
-            self.resize_table(new_capacity)
+            if self._incremental:
+                self._start_rehash(new_capacity)
+            else:
+                self.resize_table(new_capacity)
 
-        idx = self._hash_function(key) % self._capacity
-        ll = self._buckets[idx]
-        node = ll.contains(key)
-        if node is not None:
-            node.value = value  # updates the value if the key exists
-        else:
-            ll.insert(key, value)  # adds a new key/value if the key DNE
+
+    def _upsert(self, key: str, fn, default: object) -> object:
+        """
+        Does the work of setdefault(), update_with() and increment(): finds the
+        key's bucket once and updates or adds the key there (see _bucket_update).
+        Returns the key's value.
+        """
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+        self._make_room()
+
+        hash_code = self._hash_function(key)
+        buckets, idx = self._bucket_for(hash_code)
+        value, length = _bucket_update(buckets, idx, key, fn, default, hash_code)
+        if length:
             self._size += 1
- 
+            if buckets is self._buckets:
+                self._chain_added(length)
+        return value
+
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in the
+        hash map, it is added with the given default value, which is returned.
+        """
+        return self._upsert(key, None, default)
+
+
+    def update_with(self, key: str, fn, default: object = None) -> object:
+        """
+        Replaces the value associated with the given key by fn(value), or adds the
+        key with the value fn(default) if it is not in the hash map, and returns the
+        new value. Unlike a get() followed by a put(), the key is looked up once.
+        """
+        return self._upsert(key, fn, default)
+
+
+    def increment(self, key: str, delta: int = 1) -> object:
+        """
+        Adds delta to the value associated with the given key, or adds the key
+        with the value delta if it is not in the hash map, and returns the new value.
+        """
+        return self._upsert(key, lambda value: value + delta, 0)
+
+
+    def _new_buckets(self, capacity: int, entries: ChainEntries = None):
+        """
+        Returns an array of the given number of empty buckets: a DynamicArray, or
+        with array chains an ArrayChains over the given entries (new ones if None).
+        """
+        if not self._array_chains:
+            return DynamicArray(length=capacity)
+        return ArrayChains(capacity, ChainEntries() if entries is None else entries)
+
+
+    def _reset_chain_lengths(self) -> None:
+        """
+        Resets the chain length counts for a bucket array with no keys.
+        """
+        # number of buckets (in self._buckets) holding each number of keys
+        self._chain_lengths = [self._capacity]
+        self._longest_chain = 0
+
+
+    def _chain_added(self, length: int) -> None:
+        """
+        Updates the chain length counts for a bucket that grew to the given length.
+        """
+        lengths = self._chain_lengths
+        if length == len(lengths):
+            lengths.append(0)
+        lengths[length - 1] -= 1
+        lengths[length] += 1
+        if length > self._longest_chain:
+            self._longest_chain = length
+
+
+    def _chain_removed(self, length: int) -> None:
+        """
+        Updates the chain length counts for a bucket that shrank from the given length.
+        """
+        lengths = self._chain_lengths
+        lengths[length] -= 1
+        lengths[length - 1] += 1
+        if length == self._longest_chain and lengths[length] == 0:
+            self._longest_chain -= 1
+
+
+    def _bucket_for(self, hash_code: int) -> tuple:
+        """
+        Returns the bucket array and index of the bucket a key with the given
+        hash lives in. While a resize is in progress, keys whose old bucket
+        hasn't been migrated yet are still found in the old bucket array.
+        Hashes are non-negative in power-of-two mode, where % by the capacity
+        keeps the same low bits as masking with capacity - 1.
+        """
+        if self._old_buckets is not None:
+            old_idx = hash_code % self._old_capacity
+            if old_idx >= self._rehash_idx:
+                return self._old_buckets, old_idx
+        return self._buckets, hash_code % self._capacity
+
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Allocates a new bucket array of (at least) the given capacity and makes
+        the current one the old array that links are migrated from.
+        """
+        self._finish_rehash()
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._rehash_idx = 0
+
+        self._capacity = self._policy.round_up(new_capacity)
+
+        # keep growing the same way put() would while re-inserting
+        while (self._size - 1) / self._capacity >= 1:
+            self._capacity = self._policy.round_up(self._capacity * 2)
+
+        # array chains keep their entries where they are and only relink them
+        entries = self._old_buckets.entries if self._array_chains else None
+        self._buckets = self._new_buckets(self._capacity, entries)
+        self._reset_chain_lengths()
+
+
+    def _rehash_step(self, buckets: int) -> None:
+        """
+        Migrates up to the given number of old buckets into the new bucket array,
+        using the hash cached in each entry, and drops the old array once all of
+        its buckets have been migrated.
+        """
+        old_buckets = self._old_buckets
+        stop = min(self._rehash_idx + buckets, self._old_capacity)
+
+        for idx in range(self._rehash_idx, stop):
+            _move_bucket(old_buckets, idx, self._buckets, self._capacity, self._chain_added)
+
+        self._rehash_idx = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+
+
+    def _finish_rehash(self) -> None:
+        """
+        Completes a resize that is in progress, if any.
+        """
+        if self._old_buckets is not None:
+            self._rehash_step(self._old_capacity)
+
 
     def empty_buckets(self) -> int:
         """
-        Returns the number of empty buckets in the hash table.
+        Returns the number of empty buckets in the hash table. During an
+        incremental resize, the keys not yet migrated are counted in the new
+        buckets they will move to, without migrating them; that takes time
+        proportional to the old buckets left, and no time otherwise.
         """
-        idx = 0 
-        empty_buckets = 0
-        while idx != self._capacity:
-            bucket = self._buckets[idx]
-            if bucket.length() == 0:
-                empty_buckets += 1
-            idx += 1
-        
-        return empty_buckets
+        empty = self._chain_lengths[0]
+        if self._old_buckets is None:
+            return empty
+
+        buckets, capacity = self._buckets, self._capacity
+        pending = {hash_code % capacity
+                   for idx in range(self._rehash_idx, self._old_capacity)
+                   for hash_code in _bucket_hashes(self._old_buckets, idx)}
+        return empty - sum(1 for idx in pending if buckets[idx] is None)
 
 
     def table_load(self) -> float:
@@ -132,45 +777,47 @@ class HashMap:
         return load_factor
 
 
+    def stats(self) -> dict:
+        """
+        Returns the map's occupancy counters, which are kept up to date by every
+        operation instead of being counted on demand. During an incremental
+        resize, longest_chain describes the new bucket array (links not yet
+        migrated are left out) and empty_buckets is as for empty_buckets().
+        """
+        return {
+            'entries': self._size,
+            'capacity': self._capacity,
+            'load_factor': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'tombstones': 0,
+            'longest_chain': self._longest_chain,
+            'rehashing': self._old_buckets is not None,
+        }
+
+
     def clear(self) -> None:
         """
         Clears the contents of the hash map. It does not change the
         underlying hash table capacity.
         """
-        self._buckets = DynamicArray()
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        self._buckets = self._new_buckets(self._capacity)
         self._size = 0 
+        self._old_buckets = None
+        self._reset_chain_lengths()
 
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Changes the capacity of the internal hash table. All existing key/value pairs
         must remain in the new hash map, and all hash table links must be rehashed.
+        Links are rehashed from the hash cached in each node, so the hash function
+        is not called again. Always completes synchronously, even in incremental mode.
         """
         if new_capacity < 1:
             return   
-        
-        old_length = self._buckets.length()
-        old_array = self._buckets
-        self._buckets = DynamicArray()
-        
-        if self._is_prime(new_capacity):
-            self._capacity = new_capacity
-        else:
-            self._capacity = self._next_prime(new_capacity)
-
-        self._size = 0 # reset before putting in new values
-
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList()) # fill up with empty ll's
 
-        for idx in range(old_length): # fill up with old key/values
-            bucket = old_array[idx]
-            for node in bucket:
-                key = node.key
-                value = node.value
-                self.put(key, value)
+        self._start_rehash(new_capacity)
+        self._finish_rehash()
 
 
     def get(self, key: str):
@@ -178,11 +825,12 @@ class HashMap:
         Returns the value associated with the given key. If the key is not in the hash
         map, the method returns None.
         """
-        idx = self._hash_function(key) % self._capacity
-        ll = self._buckets[idx]
-        node = ll.contains(key)
-        if node is not None:
-            return node.value 
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+
+        hash_code = self._hash_function(key)
+        buckets, idx = self._bucket_for(hash_code)
+        return _bucket_get(buckets, idx, key, hash_code)
 
 
     def contains_key(self, key: str) -> bool:
@@ -190,22 +838,109 @@ class HashMap:
         Returns True if the given key is in the hash map, otherwise it returns False. An
         empty hash map does not contain any keys.
         """
-        value = self.get(key)
-        if value == None:
-            return False
-        else:
-            return True
- 
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+
+        # keys stored with the value None are found too
+        hash_code = self._hash_function(key)
+        buckets, idx = self._bucket_for(hash_code)
+        return _bucket_get(buckets, idx, key, hash_code, _MISSING) is not _MISSING
+
 
     def remove(self, key: str) -> None:
         """
         Removes the given key and its associated value from the hash map.
         """
-        idx = self._hash_function(key) % self._capacity
-        ll = self._buckets[idx]
-        removed = ll.remove(key)
-        if removed:
+        if self._old_buckets is not None:
+            self._rehash_step(_REHASH_STEP)
+
+        hash_code = self._hash_function(key)
+        buckets, idx = self._bucket_for(hash_code)
+        length = _bucket_remove(buckets, idx, key, hash_code)
+        if length:
             self._size -= 1 
+            if buckets is self._buckets:
+                self._chain_removed(length)
+
+
+    def put_many(self, keys, values) -> None:
+        """
+        Puts every key/value pair from two equally long iterables (or NumPy arrays).
+        The table is sized once for the whole batch and all keys are hashed in one
+        pass, instead of paying put()'s load check and resize per pair.
+        """
+        keys, values = to_list(keys), to_list(values)
+        if len(keys) != len(values):
+            raise ValueError("put_many() needs as many values as keys")
+
+        self._finish_rehash()
+        if (self._size + len(keys) - 1) / self._capacity >= 1:
+            self.resize_table(self._size + len(keys))
+
+        buckets, capacity = self._buckets, self._capacity
+        hashes = [self._hash_function(key) for key in keys]
+        for key, value, hash_code in zip(keys, values, hashes):
+            length = _bucket_put(buckets, hash_code % capacity, key, value, hash_code)
+            if length:
+                self._size += 1
+                self._chain_added(length)
+
+
+    def increment_many(self, keys, deltas, hashes=None) -> None:
+        """
+        Adds each delta to the value of the key at the same position, adding keys
+        that aren't in the hash map with the delta as their value, e.g. to merge
+        counts in bulk. The table is sized once for the whole batch. hashes can
+        give the keys' cached hashes from another map with the same hash function
+        and capacity policy (see _iter_entries()), so the keys aren't hashed again.
+        """
+        keys, deltas = to_list(keys), to_list(deltas)
+        if len(keys) != len(deltas):
+            raise ValueError("increment_many() needs as many deltas as keys")
+
+        self._finish_rehash()
+        if (self._size + len(keys) - 1) / self._capacity >= 1:
+            self.resize_table(self._size + len(keys))
+
+        if hashes is None:
+            hashes = [self._hash_function(key) for key in keys]
+        buckets, capacity = self._buckets, self._capacity
+        for key, delta, hash_code in zip(keys, deltas, to_list(hashes)):
+            _, length = _bucket_update(buckets, hash_code % capacity, key,
+                                       lambda value: value + delta, 0, hash_code)
+            if length:
+                self._size += 1
+                self._chain_added(length)
+
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys
+        (None for keys not in the hash map).
+        """
+        keys = to_list(keys)
+        self._finish_rehash()
+
+        buckets, capacity = self._buckets, self._capacity
+        hashes = [self._hash_function(key) for key in keys]
+        return [_bucket_get(buckets, hash_code % capacity, key, hash_code)
+                for key, hash_code in zip(keys, hashes)]
+
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the hash map.
+        """
+        keys = to_list(keys)
+        self._finish_rehash()
+
+        buckets, capacity = self._buckets, self._capacity
+        hashes = [self._hash_function(key) for key in keys]
+        for key, hash_code in zip(keys, hashes):
+            length = _bucket_remove(buckets, hash_code % capacity, key, hash_code)
+            if length:
+                self._size -= 1
+                self._chain_removed(length)
 
 
     def get_keys_and_values(self) -> DynamicArray:
@@ -214,16 +949,86 @@ class HashMap:
         stored in the hash map.
         """
         dynamic_array = DynamicArray()
+        dynamic_array.extend(self._iter_items())
+        return dynamic_array
 
-        for idx in range(self._capacity):
-            ll = self._buckets[idx]
-            for node in ll:
-                if node is not None:
-                    key = node.key
-                    value = node.value
-                    dynamic_array.append((key, value))
 
-        return dynamic_array
+    def _iter_items(self):
+        """
+        Yields each key/value pair in the hash map, straight from the buckets.
+        """
+        for _, key, value in self._iter_entries():
+            yield key, value
+
+
+    def _iter_entries(self):
+        """
+        Yields the cached hash, key and value of each entry in the hash map.
+        """
+        self._finish_rehash()
+        if self._array_chains:
+            entries = self._buckets.entries
+            for i in entries.live():
+                yield entries.hashes[i], entries.keys[i], entries.values[i]
+            return
+
+        for bucket in self._buckets:
+            for node in _nodes(bucket):
+                yield node.hash, node.key, node.value
+
+
+    def keys(self) -> HashMapView:
+        """
+        Returns a lazy view of the keys in the hash map.
+        """
+        return HashMapView(self, 0)
+
+
+    def values(self) -> HashMapView:
+        """
+        Returns a lazy view of the values in the hash map.
+        """
+        return HashMapView(self, 1)
+
+
+    def items(self) -> HashMapView:
+        """
+        Returns a lazy view of the key/value pairs in the hash map.
+        """
+        return HashMapView(self)
+
+
+    def save(self, path: str) -> None:
+        """
+        Writes the hash map, cached hashes included, to a file in the compact
+        snapshot format of hash_map_frozen.
+        """
+        hash_map_frozen.save(self, path)
+
+
+    @staticmethod
+    def load(path: str) -> hash_map_frozen.FrozenHashMap:
+        """
+        Opens a file written by save() as a read-only FrozenHashMap, which
+        memory-maps the file and looks keys up in it without rebuilding the map.
+        """
+        return hash_map_frozen.load(path)
+
+
+    def __iter__(self):
+        """
+        Lets the hash map iterate across itself, yielding an SLNode for each
+        key/value pair (array chains hold no nodes, so theirs are made on the fly).
+        Every call returns a new generator, so iterations can be nested.
+        """
+        if self._array_chains:
+            for hash_code, key, value in self._iter_entries():
+                yield SLNode(key, value, None, hash_code)
+            return
+
+        self._finish_rehash()
+        for bucket in self._buckets:
+            yield from _nodes(bucket)
 
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
@@ -234,28 +1039,19 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
     map = HashMap()
 
-    for idx in range(da.length()): # first store each element as a k/v: element/frequency
-        key = da[idx]
-        if map.contains_key(key):
-            value = map.get(key) 
-            value += 1
-            map.put(key, value)
-        else:
-            map.put(key, 1)
+    for key in da: # first store each element as a k/v: element/frequency
+        map.increment(key)
 
-    keys_and_values = map.get_keys_and_values() # then find the highest frequency
-    frequency = 0 
-    for idx in range(keys_and_values.length()):
-        key_value = keys_and_values[idx]
-        if key_value[1] > frequency:
-            frequency = key_value[1]
+    frequency = 0 # then find the highest frequency
+    for value in map.values():
+        if value > frequency:
+            frequency = value
 
     mode_array = DynamicArray()
 
-    for idx in range(keys_and_values.length()): # fill up array with mode(s)
-        key_value = keys_and_values[idx]
-        if key_value[1] == frequency:
-            mode_array.append(key_value[0]) 
+    for key, value in map.items(): # fill up array with mode(s)
+        if value == frequency:
+            mode_array.append(key) 
 
     return (mode_array, frequency)
 
@@ -263,6 +1059,7 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
+    pass
 
 
     # print('-------------------------')
@@ -0,0 +1,308 @@
+# Description: Implementation of a HashMap with SwissTable-style grouped open addressing.
+#              A control-byte array holds 7 bits of each key's hash, and probing
+#              searches a whole group of 16 slots at once, so only candidate slots
+#              touch the Python key objects. Single-key operations search the control
+#              bytes with bytearray.find(); get_many() matches the groups of a whole
+#              batch of keys with NumPy, through a view of the same bytes.
+
+from array import array
+
+import numpy as np
+
+from a6_include import DynamicArray, HashEntry, mix_hash, mix_hash_array, to_list
+
+_GROUP_WIDTH = 16
+_GROUP_OFFSETS = np.arange(_GROUP_WIDTH)
+
+# control bytes: 0x00-0x7F mark a full slot and hold the low 7 bits of its hash,
+# the high bit marks a free slot
+_EMPTY = 0x80
+_DELETED = 0xFE
+
+_MAX_LOAD = 0.875  # occupancy (live + deleted) that triggers a resize
+_HASH_MASK = (1 << 64) - 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses grouped probing over
+        NumPy control bytes for collision resolution
+        """
+        self._allocate(self._groups_for(capacity))
+        self._hash_function = function
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._ctrl[i] & _EMPTY:
+                entry = None
+            else:
+                entry = f"K: {self._keys[i]} V: {self._values[i]}"
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    @staticmethod
+    def _groups_for(capacity: int) -> int:
+        """
+        Return the number of groups (a power of two) needed to hold
+        at least the given number of slots
+        """
+        groups = 1
+        while groups * _GROUP_WIDTH < capacity:
+            groups *= 2
+        return groups
+
+    def _allocate(self, groups: int) -> None:
+        """
+        Replace the slot arrays with empty arrays for the given number of groups
+        """
+        self._groups = groups
+        self._capacity = groups * _GROUP_WIDTH
+        # the NumPy arrays are views of the bytearray and array, for get_many()
+        self._ctrl = bytearray([_EMPTY]) * self._capacity
+        self._ctrl_array = np.frombuffer(self._ctrl, dtype=np.uint8)
+        self._hashes = array('Q', bytes(8 * self._capacity))
+        self._hashes_array = np.frombuffer(self._hashes, dtype=np.uint64)
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._tombstones = 0
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find_slot(self, key: str, hash_code: int) -> int:
+        """
+        Returns the index of the slot holding the given key (hash_code is the
+        mixed hash), or -1 if the key is not in the hash map.
+        """
+        ctrl, hashes, keys = self._ctrl, self._hashes, self._keys
+        tag = hash_code & 0x7F
+        mask = self._groups - 1
+        group = (hash_code >> 7) & mask
+
+        for step in range(1, self._groups + 1):
+            start = group * _GROUP_WIDTH
+            end = start + _GROUP_WIDTH
+            slot = ctrl.find(tag, start, end)
+            while slot >= 0:
+                if hashes[slot] == hash_code and keys[slot] == key:
+                    return slot
+                slot = ctrl.find(tag, slot + 1, end)
+            if ctrl.find(_EMPTY, start, end) >= 0:
+                return -1
+            group = (group + step) & mask  # triangular probing over groups
+
+        return -1
+
+
+    def _insert_new(self, key: str, value: object, hash_code: int) -> None:
+        """
+        Stores a key that is known not to be in the hash map in the first
+        free (empty or deleted) slot of its probe sequence.
+        """
+        ctrl = self._ctrl
+        mask = self._groups - 1
+        group = (hash_code >> 7) & mask
+
+        for step in range(1, self._groups + 1):
+            start = group * _GROUP_WIDTH
+            end = start + _GROUP_WIDTH
+            slot = ctrl.find(_EMPTY, start, end)
+            deleted = ctrl.find(_DELETED, start, slot if slot >= 0 else end)
+            if deleted >= 0:
+                slot = deleted
+                self._tombstones -= 1
+            if slot >= 0:
+                ctrl[slot] = hash_code & 0x7F
+                self._hashes[slot] = hash_code
+                self._keys[slot] = key
+                self._values[slot] = value
+                self._size += 1
+                return
+            group = (group + step) & mask
+
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key already exists,
+        its value is replaced by the new value. If the key doesn't exist,
+        a new key/value pair is added.
+        """
+        if (self._size + self._tombstones + 1) / self._capacity > _MAX_LOAD:
+            if self._tombstones > self._size:
+                self.resize_table(self._capacity)  # same-capacity compaction
+            else:
+                self.resize_table(self._capacity * 2)
+
+        # group index and tag come from different bits, so weak hashes are mixed first
+        hash_code = mix_hash(self._hash_function(key))
+        slot = self._find_slot(key, hash_code)
+        if slot >= 0:
+            self._values[slot] = value
+        else:
+            self._insert_new(key, value, hash_code)
+
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+        """
+        return int(np.count_nonzero(self._ctrl_array & _EMPTY))
+
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table, rounded up to a power-of-two
+        number of groups. Entries are placed using their cached hashes, so the hash
+        function is not called again.
+        """
+        if new_capacity < self._size:
+            return
+
+        groups = self._groups_for(new_capacity)
+        while self._size > groups * _GROUP_WIDTH * _MAX_LOAD:
+            groups *= 2
+
+        old_ctrl, old_hashes = self._ctrl_array, self._hashes
+        old_keys, old_values = self._keys, self._values
+
+        self._allocate(groups)
+        self._size = 0  # reset before putting in old values
+
+        for slot in np.flatnonzero(old_ctrl < _EMPTY).tolist():
+            self._insert_new(old_keys[slot], old_values[slot], old_hashes[slot])
+
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, the method returns None.
+        """
+        slot = self._find_slot(key, mix_hash(self._hash_function(key)))
+        if slot >= 0:
+            return self._values[slot]
+
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys
+        (None for keys not in the hash map). All keys are hashed up front and
+        every probe round matches the control groups of all unresolved keys
+        in one vectorized step.
+        """
+        keys = to_list(keys)
+        results = [None] * len(keys)
+        if not keys:
+            return results
+
+        hashes = mix_hash_array(np.fromiter(
+            (self._hash_function(key) & _HASH_MASK for key in keys),
+            dtype=np.uint64, count=len(keys)))
+        tags = (hashes & np.uint64(0x7F)).astype(np.uint8)
+        mask = self._groups - 1
+        groups = ((hashes >> np.uint64(7)) & np.uint64(mask)).astype(np.int64)
+        pending = np.arange(len(keys))
+
+        for step in range(1, self._groups + 1):
+            starts = groups[pending] * _GROUP_WIDTH
+            windows = self._ctrl_array[starts[:, None] + _GROUP_OFFSETS]
+
+            # only slots whose tag and full cached hash both match reach the key compare
+            rows, cols = np.nonzero(windows == tags[pending, None])
+            slots = starts[rows] + cols
+            same_hash = self._hashes_array[slots] == hashes[pending[rows]]
+            found = np.zeros(pending.size, dtype=bool)
+            for row, slot in zip(rows[same_hash].tolist(), slots[same_hash].tolist()):
+                idx = pending[row]
+                if not found[row] and self._keys[slot] == keys[idx]:
+                    results[idx] = self._values[slot]
+                    found[row] = True
+
+            # keys whose group still had an empty slot are definitely absent
+            pending = pending[~found & ~(windows == _EMPTY).any(axis=1)]
+            if not pending.size:
+                break
+            groups[pending] = (groups[pending] + step) & mask
+
+        return results
+
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map,
+        otherwise it returns False.
+        """
+        return self._find_slot(key, mix_hash(self._hash_function(key))) >= 0
+
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        """
+        slot = self._find_slot(key, mix_hash(self._hash_function(key)))
+        if slot < 0:
+            return
+
+        # probe sequences stop at a group with an empty slot, so a slot in
+        # such a group can be freed without leaving a tombstone
+        start = slot - slot % _GROUP_WIDTH
+        if self._ctrl.find(_EMPTY, start, start + _GROUP_WIDTH) >= 0:
+            self._ctrl[slot] = _EMPTY
+        else:
+            self._ctrl[slot] = _DELETED
+            self._tombstones += 1
+        self._keys[slot] = None
+        self._values[slot] = None
+        self._size -= 1
+
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the underlying hash
+        table capacity.
+        """
+        self._allocate(self._groups)
+        self._size = 0
+
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+        """
+        dynamic_array = DynamicArray()
+        for slot in np.flatnonzero(self._ctrl_array < _EMPTY).tolist():
+            dynamic_array.append((self._keys[slot], self._values[slot]))
+        return dynamic_array
+
+
+    def __iter__(self):
+        """
+        Lets the hash map iterate across itself, yielding a HashEntry
+        for each full slot.
+        """
+        for slot in np.flatnonzero(self._ctrl_array < _EMPTY).tolist():
+            yield HashEntry(self._keys[slot], self._values[slot])
@@ -0,0 +1,351 @@
+# Description: Streaming mode finders for inputs too large to hold in memory. A counter
+#              consumes any iterable one chunk at a time and reports the mode(s) and the
+#              top-k most frequent items. ExactCounter keeps a count for every distinct
+#              item in the SC HashMap, like find_mode. SpaceSaving keeps a fixed number
+#              of counters and CountMinSketch a fixed table of them plus a fixed number
+#              of top-k candidates; both trade exact counts for bounded memory and
+#              report how far off their counts can be.
+#
+# Usage:       python heavy_hitters.py FILE [--top K] [--counters M | --epsilon E]
+#                                       [--chunk-size N] [--function NAME]
+#              (one item per line, - reads stdin; without --counters or --epsilon
+#              counts are exact)
+
+import argparse
+import heapq
+import math
+import sys
+from itertools import islice
+from operator import itemgetter
+
+import numpy as np
+
+import a6_include
+from a6_include import DynamicArray, hash_function_builtin, mix_hash, mix_hash_array
+from hash_map_sc import HashMap
+
+_CHUNK_SIZE = 1 << 16
+_HASH_MASK = (1 << 64) - 1
+
+
+def chunks(iterable, size: int = _CHUNK_SIZE):
+    """
+    Yields the items of an iterable as lists of up to the given size,
+    so only one chunk of a stream is in memory at a time.
+    """
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def _modes(counts) -> (DynamicArray, int):
+    """
+    Returns a DynamicArray of the items with the highest count among the given
+    (item, count) pairs, and that count, like find_mode.
+    """
+    mode_array = DynamicArray()
+    frequency = 0
+    for item, count in counts:
+        if count > frequency:
+            mode_array = DynamicArray()
+            frequency = count
+        if count == frequency:
+            mode_array.append(item)
+    return mode_array, frequency
+
+
+class ExactCounter:
+    """
+    Exact count of every distinct item, kept in a separate chaining HashMap.
+    Each chunk goes to the map in one increment_many() call, so the table is
+    sized once per chunk. Memory grows with the number of distinct items.
+    """
+
+    def __init__(self, function=hash_function_builtin) -> None:
+        """Initialize a counter whose HashMap uses the given hash function."""
+        self._counts = HashMap(11, function)
+        self._total = 0
+
+    def update(self, items) -> None:
+        """Counts the items of an iterable, such as one chunk of a stream."""
+        items = list(items)
+        self._counts.increment_many(items, [1] * len(items))
+        self._total += len(items)
+
+    def get_total(self) -> int:
+        """Return the number of items counted so far."""
+        return self._total
+
+    def estimate(self, item: object) -> int:
+        """Return the number of times the item has been counted."""
+        count = self._counts.get(item)
+        return 0 if count is None else count
+
+    def error_bound(self) -> int:
+        """Return the most any count can be off by, which is 0."""
+        return 0
+
+    def top_k(self, k: int) -> list:
+        """Return the k most frequent items as (item, count, error) tuples."""
+        return [(item, count, 0) for item, count
+                in heapq.nlargest(k, self._counts.items(), key=itemgetter(1))]
+
+    def modes(self) -> (DynamicArray, int):
+        """Return the mode(s) and their frequency, like find_mode."""
+        return _modes(self._counts.items())
+
+
+class _CountHeap:
+    """
+    Counts of a bounded set of items, kept in a HashMap (item -> [count, error])
+    with a min-heap of one (count, seq, item) entry per item. Counts only grow,
+    so an entry's count is at most its item's and is brought up to date when it
+    reaches the top of the heap; raising a count never touches the heap.
+    """
+
+    def __init__(self, function) -> None:
+        """Initialize an empty set of counts whose HashMap uses the given hash function."""
+        self.counts = HashMap(11, function)
+        self._heap = []
+        self._seq = 0
+
+    def _push(self, count: int, item: object) -> None:
+        """Records an item's count on the min-heap."""
+        heapq.heappush(self._heap, (count, self._seq, item))
+        self._seq += 1
+
+    def add(self, item: object, count: int, error: int = 0) -> list:
+        """Adds a count for an item that has none and returns its [count, error] entry."""
+        entry = [count, error]
+        self.counts.put(item, entry)
+        self._push(count, item)
+        return entry
+
+    def min(self) -> tuple:
+        """Returns (item, count) of the least frequent item."""
+        heap = self._heap
+        while True:
+            count, _, item = heap[0]
+            current = self.counts.get(item)[0]
+            if current == count:
+                return item, count
+            heapq.heapreplace(heap, (current, self._seq, item))  # counted again since pushed
+            self._seq += 1
+
+    def pop_min(self) -> tuple:
+        """Removes the least frequent item's count and returns (item, count)."""
+        item, count = self.min()
+        heapq.heappop(self._heap)
+        self.counts.remove(item)
+        return item, count
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters: at most `counters` items are counted. An item
+    that isn't counted takes over the counter of the least frequent one and
+    inherits its count, which is recorded as that counter's error. Every
+    count overestimates its item by no more than its error, which is at most
+    total / counters, and every item occurring more often than that is counted.
+    """
+
+    def __init__(self, counters: int = 1000, function=hash_function_builtin) -> None:
+        """Initialize a summary of the given number of counters."""
+        if counters < 1:
+            raise ValueError("SpaceSaving needs at least one counter")
+        self._capacity = counters
+        self._heap = _CountHeap(function)
+        self._counters = self._heap.counts  # item -> [count, error]
+        self._total = 0
+
+    def update(self, items) -> None:
+        """Counts the items of an iterable, such as one chunk of a stream."""
+        counters = self._counters
+        total = 0
+        for item in items:
+            entry = counters.get(item)
+            if entry is not None:
+                entry[0] += 1
+            elif counters.get_size() < self._capacity:
+                self._heap.add(item, 1)
+            else:
+                _, floor = self._heap.pop_min()
+                self._heap.add(item, floor + 1, floor)
+            total += 1
+        self._total += total
+
+    def get_total(self) -> int:
+        """Return the number of items counted so far."""
+        return self._total
+
+    def estimate(self, item: object) -> int:
+        """
+        Return the item's count: an overestimate by at most error_bound(),
+        or 0 if the item isn't counted (it then occurred at most error_bound() times).
+        """
+        entry = self._counters.get(item)
+        return 0 if entry is None else entry[0]
+
+    def error_bound(self) -> int:
+        """Return the most any count can be off by (at most total / counters)."""
+        if self._counters.get_size() < self._capacity:
+            return 0
+        return min(entry[0] for entry in self._counters.values())
+
+    def top_k(self, k: int) -> list:
+        """
+        Return the k items with the highest counts as (item, count, error) tuples;
+        each item occurred between count - error and count times.
+        """
+        return heapq.nlargest(k, ((item, entry[0], entry[1]) for item, entry
+                                  in self._counters.items()), key=itemgetter(1))
+
+    def modes(self) -> (DynamicArray, int):
+        """Return the item(s) with the highest count and that count."""
+        return _modes((item, entry[0]) for item, entry in self._counters.items())
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch: `depth` rows of `width` counters, each row indexed by its own
+    seeded mix of an item's hash. An item's estimate is the smallest of its
+    counters, so it never undercounts, and with probability 1 - delta it
+    overcounts by at most epsilon * total. The table cannot list its items, so
+    the `candidates` items with the highest estimates when last seen are kept
+    alongside it for top_k() and modes(). Memory depends only on epsilon, delta
+    and candidates.
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01,
+                 function=hash_function_builtin, candidates: int = 100) -> None:
+        """Initialize a sketch for the given error rate and failure probability."""
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        if candidates < 1:
+            raise ValueError("CountMinSketch needs at least one candidate")
+        self._epsilon = epsilon
+        self._width = math.ceil(math.e / epsilon)
+        self._depth = math.ceil(math.log(1 / delta))
+        self._table = np.zeros((self._depth, self._width), dtype=np.int64)
+        self._seeds = np.array([mix_hash(row + 1) for row in range(self._depth)], dtype=np.uint64)
+        self._function = function
+        self._capacity = candidates
+        self._candidates = _CountHeap(function)  # item -> [estimate, 0]
+        self._total = 0
+
+    def _columns(self, items: list) -> np.ndarray:
+        """Return the counter column of each item in each row (depth x len(items))."""
+        hashes = np.fromiter((self._function(item) & _HASH_MASK for item in items),
+                             dtype=np.uint64, count=len(items))
+        rows = mix_hash_array(hashes[None, :], self._seeds[:, None])
+        return (rows % np.uint64(self._width)).astype(np.intp)
+
+    def update(self, items) -> None:
+        """Counts the items of an iterable, such as one chunk of a stream."""
+        items = list(items)
+        if not items:
+            return
+        columns = self._columns(items)
+        for row in range(self._depth):
+            self._table[row] += np.bincount(columns[row], minlength=self._width)
+        self._total += len(items)
+
+        estimates = self._table[np.arange(self._depth)[:, None], columns].min(axis=0)
+        candidates = self._candidates
+        counts = candidates.counts
+        for item, estimate in zip(items, estimates.tolist()):
+            entry = counts.get(item)
+            if entry is not None:
+                entry[0] = estimate
+            elif counts.get_size() < self._capacity:
+                candidates.add(item, estimate)
+            elif estimate > candidates.min()[1]:
+                candidates.pop_min()
+                candidates.add(item, estimate)
+
+    def get_total(self) -> int:
+        """Return the number of items counted so far."""
+        return self._total
+
+    def estimate(self, item: object) -> int:
+        """Return the item's estimated count, which is never too low."""
+        columns = self._columns([item])[:, 0]
+        return int(self._table[np.arange(self._depth), columns].min())
+
+    def error_bound(self) -> float:
+        """Return the most an estimate overcounts by, with probability 1 - delta."""
+        return self._epsilon * self._total
+
+    def top_k(self, k: int) -> list:
+        """
+        Return the k candidates with the highest estimates as (item, estimate, error)
+        tuples, error being error_bound() rounded up.
+        """
+        error = math.ceil(self.error_bound())
+        return heapq.nlargest(k, ((item, entry[0], error) for item, entry
+                                  in self._candidates.counts.items()), key=itemgetter(1))
+
+    def modes(self) -> (DynamicArray, int):
+        """Return the candidate(s) with the highest estimate and that estimate."""
+        return _modes((item, entry[0]) for item, entry in self._candidates.counts.items())
+
+
+def stream_mode(iterable, counter=None, chunk_size: int = _CHUNK_SIZE) -> (DynamicArray, int):
+    """
+    Finds the mode(s) of a stream, like find_mode but without holding the input
+    in memory: the items are fed to the counter (an ExactCounter by default, or a
+    SpaceSaving summary or CountMinSketch for bounded memory) one chunk at a time.
+    """
+    if counter is None:
+        counter = ExactCounter()
+    for chunk in chunks(iterable, chunk_size):
+        counter.update(chunk)
+    return counter.modes()
+
+
+def format_top(counter, k: int) -> str:
+    """
+    Returns the counter's top k items as a readable table.
+    """
+    out = f"{'count':>12}{'error':>10}  item\n"
+    for item, count, error in counter.top_k(k):
+        out += f"{count:>12}{error:>10}  {item}\n"
+    out += f"{counter.get_total()} items, counts off by at most {counter.error_bound()}\n"
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report the most frequent lines of a file or stream.")
+    parser.add_argument('file', help="file with one item per line, or - for stdin")
+    parser.add_argument('--top', type=int, default=10,
+                        help="number of items to report (default: 10)")
+    bounded = parser.add_mutually_exclusive_group()
+    bounded.add_argument('--counters', type=int,
+                         help="count at most this many items (Space-Saving) instead of all of them")
+    bounded.add_argument('--epsilon', type=float,
+                         help="estimate counts to within this fraction of the total (Count-Min sketch)")
+    parser.add_argument('--chunk-size', type=int, default=_CHUNK_SIZE,
+                        help=f"items read per chunk (default: {_CHUNK_SIZE})")
+    parser.add_argument('--function', default='hash_function_builtin',
+                        help="name of a hash function in a6_include (default: hash_function_builtin)")
+    args = parser.parse_args()
+
+    function = getattr(a6_include, args.function)
+    if args.counters is not None:
+        counter = SpaceSaving(args.counters, function)
+    elif args.epsilon is not None:
+        counter = CountMinSketch(args.epsilon, function=function, candidates=max(args.top, 100))
+    else:
+        counter = ExactCounter(function)
+
+    stream = sys.stdin if args.file == '-' else open(args.file, encoding='utf-8')
+    with stream:
+        for chunk in chunks((line.rstrip('\n') for line in stream), args.chunk_size):
+            counter.update(chunk)
+    print(format_top(counter, args.top), end='')
+
+
+if __name__ == "__main__":
+    main()
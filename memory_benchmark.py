@@ -0,0 +1,102 @@
+# Description: Memory footprint benchmark. Fills each hash map with a given number of
+#              string keys through put() and reports how many bytes the map itself
+#              allocated per entry (buckets, nodes or entries and cached hashes; the
+#              keys and values are allocated beforehand and not counted). With
+#              --max-bytes it exits with status 1 if any map needs more than that.
+#
+# Usage:       python memory_benchmark.py [--sizes N [N ...]] [--maps NAME [NAME ...]]
+#                                         [--function NAME] [--max-bytes B]
+
+import argparse
+import functools
+import gc
+import sys
+import tracemalloc
+
+import a6_include
+import hash_map_oa
+import hash_map_sc
+
+MAPS = {
+    'sc': hash_map_sc.HashMap,
+    'sc-array': functools.partial(hash_map_sc.HashMap, array_chains=True),
+    'oa': hash_map_oa.HashMap,
+    'oa-flat': hash_map_oa.FlatHashMap,
+    'oa-robinhood': hash_map_oa.RobinHoodHashMap,
+}
+
+
+def measure(factory, function, size: int) -> dict:
+    """
+    Builds a map with `size` entries and returns its capacity and
+    the bytes it allocated per entry.
+    """
+    keys = [f"key{i}" for i in range(size)]
+    values = list(range(size))
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        hash_map = factory(11, function)
+        for key, value in zip(keys, values):
+            hash_map.put(key, value)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    return {'entries': size, 'capacity': hash_map.get_capacity(), 'bytes_per_entry': used / size}
+
+
+def run(maps: list, function, sizes: list) -> list:
+    """
+    Returns one result (dict) per map and size.
+    """
+    results = []
+    for name in maps:
+        for size in sizes:
+            result = measure(MAPS[name], function, size)
+            result['map'] = name
+            results.append(result)
+    return results
+
+
+def format_results(results: list) -> str:
+    """
+    Returns the results as a readable table.
+    """
+    out = f"{'map':<14}{'entries':>10}{'capacity':>10}{'bytes/entry':>13}\n"
+    for result in results:
+        out += f"{result['map']:<14}{result['entries']:>10}{result['capacity']:>10}" \
+               f"{result['bytes_per_entry']:>13.1f}\n"
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report the bytes per entry used by each hash map.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="numbers of entries to measure (default: 1000 10000 100000)")
+    parser.add_argument('--maps', nargs='+', choices=list(MAPS), default=list(MAPS),
+                        help="maps to measure (default: all)")
+    parser.add_argument('--function', default='hash_function_builtin',
+                        help="name of a hash function in a6_include (default: hash_function_builtin)")
+    parser.add_argument('--max-bytes', type=float,
+                        help="exit with status 1 if any map uses more bytes per entry")
+    args = parser.parse_args()
+
+    results = run(args.maps, getattr(a6_include, args.function), args.sizes)
+    print(format_results(results), end='')
+
+    if args.max_bytes is not None:
+        over = [result for result in results if result['bytes_per_entry'] > args.max_bytes]
+        for result in over:
+            print(f"{result['map']} with {result['entries']} entries uses "
+                  f"{result['bytes_per_entry']:.1f} bytes per entry (limit {args.max_bytes})",
+                  file=sys.stderr)
+        if over:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Description: Parallel find_mode. The input is cut into chunks that worker processes
+#              count in SC HashMaps; the parent merges each partial count into one
+#              HashMap with increment_many(), reusing the hashes the workers cached,
+#              and returns the modes in find_mode's format. A file is split into byte
+#              ranges that the workers read themselves, so its lines never go through
+#              a pipe.
+#
+# Usage:       python parallel_mode.py FILE [--processes N] [--chunk-bytes N]
+#                                       [--function NAME]
+#              (one item per line)
+
+import argparse
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import a6_include
+from a6_include import DynamicArray, hash_function_builtin
+from hash_map_sc import HashMap
+from heavy_hitters import _modes, chunks
+
+_CHUNK_SIZE = 1 << 16  # items per chunk
+_CHUNK_BYTES = 1 << 22  # bytes per file range
+
+# hashed by every worker: if a worker's hash of it differs from the parent's, the
+# worker has its own seed for hash(str) (as spawned workers do), so its cached
+# hashes can't be reused
+_PROBE = "hash seed probe"
+
+
+def _count(items, function) -> tuple:
+    """
+    Worker: counts the items in an SC HashMap with one increment_many() call.
+    Returns the hash of _PROBE and the map's cached hashes, keys and counts as
+    three tuples.
+    """
+    items = list(items)
+    counts = HashMap(11, function)
+    counts.increment_many(items, [1] * len(items))
+    columns = tuple(zip(*counts._iter_entries())) or ((), (), ())
+    return (function(_PROBE),) + columns
+
+
+def _count_range(path: str, start: int, end: int, function) -> tuple:
+    """
+    Worker: counts the lines of a file that start in the byte range [start, end),
+    like _count().
+    """
+    with open(path, 'rb') as file:
+        if start:
+            file.seek(start - 1)
+            file.readline()  # the line running into the range belongs to the previous one
+        data = file.read(max(end - file.tell(), 0))
+        if data and not data.endswith(b'\n'):
+            data += file.readline()  # finish the last line
+
+    lines = data.decode('utf-8').split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return _count(lines, function)
+
+
+def _find_mode(tasks, processes: int, function) -> (DynamicArray, int):
+    """
+    Runs the (worker, *args) tasks in a pool of the given number of processes,
+    keeping at most two tasks per process in flight so a long input is not read
+    ahead, merges their counts and returns the mode(s) and their frequency.
+    """
+    total = HashMap(11, function)
+    probe = function(_PROBE)
+
+    def merge(result: tuple) -> None:
+        worker_probe, hashes, keys, counts = result
+        total.increment_many(keys, counts, hashes if worker_probe == probe else None)
+
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(processes) as pool:
+        pending = set()
+        for task, *args in tasks:
+            if len(pending) >= 2 * processes:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(future.result())
+            pending.add(pool.submit(task, *args))
+        for future in pending:
+            merge(future.result())
+
+    return _modes(total.items())
+
+
+def find_mode_parallel(items, processes: int = None, chunk_size: int = _CHUNK_SIZE,
+                       function=hash_function_builtin) -> (DynamicArray, int):
+    """
+    Finds the mode(s) and frequency of the elements of a DynamicArray (or any other
+    iterable) like find_mode, counting chunks of it in worker processes (one per
+    CPU by default). The modes may be listed in a different order than find_mode's.
+    """
+    tasks = ((_count, chunk, function) for chunk in chunks(items, chunk_size))
+    return _find_mode(tasks, processes, function)
+
+
+def find_mode_file(path: str, processes: int = None, chunk_bytes: int = _CHUNK_BYTES,
+                   function=hash_function_builtin) -> (DynamicArray, int):
+    """
+    Finds the mode(s) and frequency of the lines of a UTF-8 text file (split on
+    newlines), each worker process reading and counting its own byte ranges.
+    """
+    size = os.path.getsize(path)
+    tasks = ((_count_range, path, start, min(start + chunk_bytes, size), function)
+             for start in range(0, size, chunk_bytes))
+    return _find_mode(tasks, processes, function)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find the most frequent lines of a file in parallel.")
+    parser.add_argument('file', help="file with one item per line")
+    parser.add_argument('--processes', type=int,
+                        help="number of worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-bytes', type=int, default=_CHUNK_BYTES,
+                        help=f"bytes of the file counted per task (default: {_CHUNK_BYTES})")
+    parser.add_argument('--function', default='hash_function_builtin',
+                        help="name of a hash function in a6_include (default: hash_function_builtin)")
+    args = parser.parse_args()
+
+    modes, frequency = find_mode_file(args.file, args.processes, args.chunk_bytes,
+                                      getattr(a6_include, args.function))
+    print(f"frequency: {frequency}")
+    for mode in modes:
+        print(mode)
+
+
+if __name__ == "__main__":
+    main()
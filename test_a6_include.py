@@ -0,0 +1,102 @@
+# Description: Tests for a6_include: DynamicArray's preallocation, slicing and typed
+#              storage, the byte-oriented hash functions against their published
+#              reference vectors, and the type-tagged key encoding they hash.
+
+import unittest
+from array import array
+
+import numpy as np
+
+from a6_include import (DynamicArray, DynamicArrayException, key_to_bytes, to_list,
+                        _fnv1a, _siphash, hash_function_fnv1a, hash_function_siphash)
+
+# SipHash-2-4 reference key 00 01 .. 0f, as the seed's low 128 bits
+_SIP_KEY = int.from_bytes(bytes(range(16)), 'little')
+
+
+class TestDynamicArray(unittest.TestCase):
+    def test_preallocated(self) -> None:
+        da = DynamicArray(length=3, fill='x')
+        self.assertEqual(list(da), ['x', 'x', 'x'])
+        source = [1, 2]
+        da = DynamicArray(source)
+        da.append(3)
+        self.assertEqual(source, [1, 2])  # the list is copied, not aliased
+        self.assertEqual(DynamicArray(length=2).length(), 2)
+
+    def test_typecode(self) -> None:
+        da = DynamicArray(length=4, typecode='q')
+        self.assertIsInstance(da._data, array)
+        self.assertEqual(list(da), [0, 0, 0, 0])
+        da[1] = 7
+        da.extend(DynamicArray([8, 9], typecode='q'))
+        self.assertEqual(str(da), '[0, 7, 0, 0, 8, 9]')
+        with self.assertRaises(TypeError):
+            da.append('a')
+
+    def test_slicing(self) -> None:
+        for typecode in (None, 'q'):
+            with self.subTest(typecode=typecode):
+                da = DynamicArray(list(range(10)), typecode=typecode)
+                part = da[2:8:2]
+                self.assertIsInstance(part, DynamicArray)
+                self.assertEqual(list(part), [2, 4, 6])
+                part[0] = -1
+                self.assertEqual(da[2], 2)  # a slice is a copy
+
+                da[0:3] = DynamicArray([7, 7])
+                da[-2:] = [5, 5, 5]
+                self.assertEqual(list(da), [7, 7, 3, 4, 5, 6, 7, 5, 5, 5])
+                self.assertEqual(da._data.__class__, list if typecode is None else array)
+
+    def test_index_errors(self) -> None:
+        da = DynamicArray([1, 2])
+        for index in (-1, 2):
+            with self.assertRaises(DynamicArrayException):
+                da[index]
+            with self.assertRaises(DynamicArrayException):
+                da[index] = 0
+
+    def test_to_list(self) -> None:
+        items = to_list(np.arange(3))
+        self.assertEqual(items, [0, 1, 2])
+        self.assertIs(type(items[0]), int)
+        self.assertEqual(to_list(DynamicArray(['a'])), ['a'])
+
+
+class TestReferenceVectors(unittest.TestCase):
+    def test_fnv1a(self) -> None:
+        # FNV-1a 64-bit test vectors from the FNV reference code
+        self.assertEqual(_fnv1a(b''), 0xCBF29CE484222325)
+        self.assertEqual(_fnv1a(b'a'), 0xAF63DC4C8601EC8C)
+        self.assertEqual(_fnv1a(b'foobar'), 0x85944171F73967E8)
+
+    def test_siphash(self) -> None:
+        # SipHash-2-4 vectors from the SipHash paper, messages 00 01 .. (n - 1)
+        self.assertEqual(_siphash(b'', _SIP_KEY), 0x726FDB47DD0E0E31)
+        self.assertEqual(_siphash(bytes(range(15)), _SIP_KEY), 0xA129CA6149BE45E5)
+
+    def test_keys_hash_their_encoding(self) -> None:
+        for key in ('a', b'a', 97, 2.5, ('a', 1), None):
+            with self.subTest(key=key):
+                self.assertEqual(hash_function_fnv1a(key, 3), _fnv1a(key_to_bytes(key), 3))
+                self.assertEqual(hash_function_siphash(key, _SIP_KEY),
+                                 _siphash(key_to_bytes(key), _SIP_KEY))
+
+
+class TestKeyToBytes(unittest.TestCase):
+    def test_types_differ(self) -> None:
+        keys = ['a', b'a', 97, 97.5, None, 'None', ('a',), '\x01\x00\x00\x00a',
+                ('a', 'b'), ('ab',), (('a',),), ()]
+        encodings = [key_to_bytes(key) for key in keys]
+        self.assertEqual(len(set(encodings)), len(keys))
+
+    def test_equal_keys_agree(self) -> None:
+        self.assertEqual(key_to_bytes(1), key_to_bytes(1.0))
+        self.assertEqual(key_to_bytes(1), key_to_bytes(True))
+        self.assertEqual(key_to_bytes(b'ab'), key_to_bytes(bytearray(b'ab')))
+        self.assertEqual(key_to_bytes((1, 'x')), key_to_bytes((1.0, 'x')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# Description: Tests for the hash function quality analyzer: bucket statistics and the
+#              quadratic probe simulation on hash sets with known answers, the
+#              avalanche test, and the full report.
+
+import time
+import unittest
+
+import numpy as np
+
+from a6_include import hash_function_1, hash_function_siphash
+from hash_analyzer import analyze, avalanche_stats, bucket_stats, format_report, quadratic_probe_stats
+
+
+def hashes(values) -> np.ndarray:
+    """
+    Returns the given hash codes as a uint64 array.
+    """
+    return np.array(values, dtype=np.uint64)
+
+
+class TestBucketStats(unittest.TestCase):
+    def test_counts(self) -> None:
+        stats = bucket_stats(hashes([0, 5, 10, 1, 3]), 5)  # buckets 0, 0, 0, 1, 3
+        self.assertEqual(stats['empty_buckets'], 2)
+        self.assertEqual(stats['occupancy_histogram'], {0: 2, 1: 2, 3: 1})
+        self.assertEqual(stats['bucket_collisions'], 2)
+        self.assertEqual(stats['sc_max_chain'], 3)
+        self.assertEqual(stats['sc_mean_chain'], 5 / 3)
+        self.assertEqual(stats['sc_mean_probes'], (1 + 2 + 3 + 1 + 1) / 5)
+
+
+class TestQuadraticProbeStats(unittest.TestCase):
+    def test_distinct_homes(self) -> None:
+        stats = quadratic_probe_stats(hashes([0, 1, 2, 3]), 11)
+        self.assertEqual((stats['oa_mean_probes'], stats['oa_max_probes'], stats['oa_unplaced']),
+                         (1.0, 1, 0))
+
+    def test_one_home(self) -> None:
+        # with a prime capacity, home + j * j hits a new bucket for every j <= capacity // 2
+        stats = quadratic_probe_stats(hashes([7] * 6), 23)
+        self.assertEqual((stats['oa_mean_probes'], stats['oa_max_probes'], stats['oa_unplaced']),
+                         (3.5, 6, 0))
+
+    def test_unreachable_buckets(self) -> None:
+        # one home only reaches capacity // 2 + 1 buckets of a prime table
+        stats = quadratic_probe_stats(hashes([0] * 20), 23)
+        self.assertEqual(stats['oa_unplaced'], 20 - 12)
+        self.assertFalse(stats['oa_truncated'])
+
+    def test_truncated(self) -> None:
+        stats = quadratic_probe_stats(hashes([0] * 20), 101, max_probes=5)
+        self.assertEqual((stats['oa_max_probes'], stats['oa_unplaced']), (5, 15))
+        self.assertTrue(stats['oa_truncated'])
+
+    def test_full_table_skipped(self) -> None:
+        self.assertIsNone(quadratic_probe_stats(hashes(range(11)), 11)['oa_mean_probes'])
+
+    def test_skewed_hashes_stay_fast(self) -> None:
+        start = time.perf_counter()
+        stats = quadratic_probe_stats(hashes([42] * 100000), 200003)
+        self.assertLess(time.perf_counter() - start, 10)
+        # one key is placed per round, so the default cap of 1 << 16 rounds cuts it short
+        self.assertEqual(stats['oa_unplaced'], 100000 - (1 << 16))
+        self.assertTrue(stats['oa_truncated'])
+
+
+class TestReport(unittest.TestCase):
+    def test_avalanche(self) -> None:
+        keys = ['key' + str(i) for i in range(200)]
+        good = avalanche_stats(hash_function_siphash, keys)
+        poor = avalanche_stats(hash_function_1, keys)
+        self.assertLess(abs(good['avalanche_mean'] - 0.5), 0.02)
+        self.assertLess(good['avalanche_worst_bias'], 0.05)
+        self.assertLess(poor['avalanche_mean'], 0.1)
+        self.assertEqual(poor['avalanche_worst_bias'], 0.5)
+        self.assertIsNone(avalanche_stats(hash_function_siphash, [1, 2])['avalanche_mean'])
+
+    def test_analyze(self) -> None:
+        keys = ['abc', 'acb', 'bca', 'xyz']  # hash_function_1 ignores character order
+        report = analyze(hash_function_1, keys, 11)
+        self.assertEqual((report['keys'], report['capacity'], report['hash_collisions']), (4, 11, 2))
+        self.assertIn('full-hash collisions: 2', format_report(report))
+
+
+if __name__ == '__main__':
+    unittest.main()
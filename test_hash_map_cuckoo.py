@@ -0,0 +1,56 @@
+# Description: Tests for the cuckoo hashing HashMap: the stash stays within its four
+#              entries for ordinary keys, and keys that no seed can separate are
+#              stored without endless rebuilding and move back out of the stash as
+#              their buckets free up.
+
+import unittest
+
+from a6_include import hash_function_1, hash_function_builtin
+from hash_map_cuckoo import HashMap, _STASH_SIZE
+
+
+class TestStash(unittest.TestCase):
+    def test_bounded(self) -> None:
+        # hash_function_1 collides for many of these keys, the seeded hashes don't
+        hash_map = HashMap(11, hash_function_1)
+        keys = ['key' + str(i) for i in range(5000)]
+        for i, key in enumerate(keys):
+            hash_map.put(key, i)
+            self.assertLessEqual(len(hash_map._stash), _STASH_SIZE)
+        self.assertEqual([hash_map.get(key) for key in keys], list(range(len(keys))))
+
+    def test_inseparable_keys(self) -> None:
+        # ints that differ by a multiple of 2**61 - 1 share hash(), so
+        # hash_function_builtin gives them the same buckets under every seed
+        keys = [5 + i * ((1 << 61) - 1) for i in range(40)]
+        hash_map = HashMap(11, hash_function_builtin, hash_function_builtin)
+        for i, key in enumerate(keys):
+            hash_map.put(key, i)
+        self.assertEqual(hash_map.get_size(), len(keys))
+        self.assertLessEqual(hash_map.get_capacity(), 256)
+        self.assertEqual([hash_map.get(key) for key in keys], list(range(len(keys))))
+
+        for key in keys[::2]:
+            hash_map.remove(key)
+        # the two buckets the keys share are refilled from the stash
+        self.assertEqual(len(hash_map._stash), hash_map.get_size() - 2)
+        self.assertEqual([hash_map.get(key) for key in keys],
+                         [None if i % 2 == 0 else i for i in range(len(keys))])
+        hash_map.put('other', -1)
+        self.assertEqual(hash_map.get('other'), -1)
+
+    def test_mixed_key_types(self) -> None:
+        # the default seeded hash tells these apart by type; if it didn't, each
+        # letter's three keys would share two buckets and stash the third
+        keys = [key for letter in 'abcdefgh'
+                for key in (letter, letter.encode(), ord(letter))]
+        keys += ['None', None, ('a',), '\x01\x00\x00\x00a']
+        hash_map = HashMap(11, hash_function_builtin)
+        for i, key in enumerate(keys):
+            hash_map.put(key, i)
+        self.assertLessEqual(len(hash_map._stash), _STASH_SIZE)
+        self.assertEqual([hash_map.get(key) for key in keys], list(range(len(keys))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+# Description: Tests for the read-only snapshots of SC and OA maps: a frozen map answers
+#              lookups like the map it was made from, other processes attach to it in
+#              shared memory, and only allowed hash functions are named and resolved.
+#              Saved files load back, a failed save leaves the old file in place, and
+#              truncated or corrupt files raise ValueError instead of hanging.
+
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+from multiprocessing import Pipe, Process
+
+import hash_map_frozen
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_fnv1a, hash_function_siphash
+from hash_map_frozen import (FrozenHashMap, _HEADER, _padded, attach, freeze, load,
+                             register_hash_function, share)
+
+MAPS = {
+    'sc': hash_map_sc.HashMap,
+    'sc power_of_two': partial(hash_map_sc.HashMap, power_of_two=True),
+    'sc array_chains': partial(hash_map_sc.HashMap, array_chains=True),
+    'oa': hash_map_oa.HashMap,
+    'oa power_of_two': partial(hash_map_oa.HashMap, power_of_two=True),
+}
+
+KEYS = ['key' + str(i) for i in range(500)] + [b'bytes', -12345678901234567890, ('tu', 'ple'), 'ünï']
+
+
+def filled(factory, function=hash_function_fnv1a):
+    """
+    Returns a map from the given factory holding every key of KEYS, mapped to
+    lists, strs and ints in turn.
+    """
+    hash_map = factory(11, function)
+    for i, key in enumerate(KEYS):
+        hash_map.put(key, [i] if i % 3 == 0 else str(i) if i % 3 == 1 else i)
+    return hash_map
+
+
+def pairs(hash_map) -> list:
+    """
+    Returns the key/value pairs stored in the given map, in a fixed order.
+    """
+    return sorted(hash_map.get_keys_and_values(), key=repr)
+
+
+def rotated_hash(key: object) -> int:
+    """
+    Returns hash_function_fnv1a of the key, rotated by one bit. Not allowed in
+    snapshots until registered.
+    """
+    hash_code = hash_function_fnv1a(key)
+    return (hash_code >> 1) | ((hash_code & 1) << 63)
+
+
+def _lookup(name: str, keys: list, connection) -> None:
+    """
+    Child process: attaches to the shared map of the given name and sends back
+    the values of the keys.
+    """
+    with attach(name) as frozen:
+        connection.send([frozen.get(key) for key in keys])
+    connection.close()
+
+
+class TestFreeze(unittest.TestCase):
+    def check(self, frozen, hash_map) -> None:
+        """
+        Checks that a frozen map holds the same pairs as the given map.
+        """
+        self.assertEqual(frozen.get_size(), hash_map.get_size())
+        self.assertEqual(pairs(frozen), pairs(hash_map))
+        for key, value in pairs(hash_map):
+            self.assertEqual(frozen.get(key), value)
+            self.assertTrue(frozen.contains_key(key))
+        self.assertIsNone(frozen.get('missing'))
+        self.assertFalse(frozen.contains_key(b'key1'))
+
+    def test_matches_map(self) -> None:
+        for name, factory in MAPS.items():
+            with self.subTest(map=name):
+                hash_map = filled(factory)
+                self.check(FrozenHashMap(freeze(hash_map)), hash_map)
+
+    def test_views(self) -> None:
+        hash_map = filled(hash_map_sc.HashMap)
+        frozen = FrozenHashMap(freeze(hash_map))
+        self.assertEqual(sorted(map(repr, frozen.keys())), sorted(map(repr, hash_map.keys())))
+        self.assertEqual(len(frozen.items()), len(KEYS))
+        self.assertIn(('key7', '7'), frozen.items())
+
+    def test_share_attach(self) -> None:
+        hash_map = filled(hash_map_oa.HashMap)
+        queries = KEYS[::7] + ['missing']
+        frozen = share(hash_map)
+        try:
+            receiver, sender = Pipe(duplex=False)
+            process = Process(target=_lookup, args=(frozen.get_name(), queries, sender))
+            process.start()
+            values = receiver.recv()
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+            self.assertEqual(values, [hash_map.get(key) for key in queries])
+        finally:
+            frozen.close()
+            frozen.unlink()
+
+
+class TestSaveLoad(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hash_map = filled(hash_map_sc.HashMap)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'map.bin')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_round_trip(self) -> None:
+        for hash_map in (self.hash_map, filled(hash_map_oa.HashMap)):
+            with self.subTest(map=type(hash_map).__module__):
+                hash_map.save(self.path)
+                with type(hash_map).load(self.path) as frozen:
+                    self.assertEqual(pairs(frozen), pairs(hash_map))
+                    self.assertEqual([frozen.get(key) for key in KEYS],
+                                     [hash_map.get(key) for key in KEYS])
+
+    def test_failed_save_keeps_file(self) -> None:
+        self.hash_map.save(self.path)
+        with open(self.path, 'rb') as file:
+            saved = file.read()
+        with self.assertRaises(ValueError):
+            filled(hash_map_sc.HashMap, rotated_hash).save(self.path)  # not allowed
+        with open(self.path, 'rb') as file:
+            self.assertEqual(file.read(), saved)
+        self.assertEqual(os.listdir(self.directory.name), ['map.bin'])
+
+    def test_load_truncated(self) -> None:
+        self.hash_map.save(self.path)
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) // 2)
+        with self.assertRaises(ValueError):
+            load(self.path)
+
+    def test_load_full_slot_table(self) -> None:
+        # point every slot at entry 0, leaving no empty slot to end a probe
+        self.hash_map.save(self.path)
+        with open(self.path, 'r+b') as file:
+            header = _HEADER.unpack(file.read(_HEADER.size))
+            entries, slots = header[2], header[3]
+            file.seek(_padded(_padded(_HEADER.size + 8 * entries) + 8 * (2 * entries + 1)))
+            file.write((1).to_bytes(4, sys.byteorder) * slots)
+        with load(self.path) as frozen:
+            with self.assertRaises(ValueError):
+                frozen.get('missing')
+
+
+class TestHashFunctionNames(unittest.TestCase):
+    def test_name_stored_not_pickled(self) -> None:
+        snapshot = freeze(filled(hash_map_sc.HashMap, hash_function_siphash))
+        self.assertIn(b'a6_include.hash_function_siphash', snapshot)
+        snapshot = freeze(filled(partial(hash_map_oa.HashMap, power_of_two=True)))
+        self.assertIn(b'mix_hash(a6_include.hash_function_fnv1a)', snapshot)
+
+    def test_unregistered_function(self) -> None:
+        hash_map = filled(hash_map_sc.HashMap, rotated_hash)
+        with self.assertRaises(ValueError):
+            freeze(hash_map)
+        register_hash_function(rotated_hash)
+        try:
+            frozen = FrozenHashMap(freeze(hash_map))
+            self.assertEqual([frozen.get(key) for key in KEYS], [hash_map.get(key) for key in KEYS])
+        finally:
+            del hash_map_frozen._HASH_FUNCTIONS[f"{__name__}.rotated_hash"]
+
+    def test_disallowed_name(self) -> None:
+        snapshot = freeze(filled(hash_map_sc.HashMap))
+        name = b'a6_include.hash_function_fnv1a'
+        # same length, so the header still matches the sections
+        for replacement in (b'os.system'.ljust(len(name), b' '), b'\xff' * len(name)):
+            with self.subTest(name=replacement):
+                with self.assertRaises(ValueError):
+                    FrozenHashMap(snapshot.replace(name, replacement))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# Description: Tests for the partitioned HashMap: the consistent-hash ring only moves the
+#              keys a new shard takes over, and adding and removing shard processes
+#              keeps every pair reachable.
+
+import unittest
+
+from hash_map_partitioned import HashRing, PartitionedHashMap
+
+
+def pairs(hash_map) -> list:
+    """
+    Returns the sorted (key, value) pairs stored in a hash map.
+    """
+    return sorted(hash_map.get_keys_and_values())
+
+
+class TestHashRing(unittest.TestCase):
+    def test_only_new_shard_takes_keys(self) -> None:
+        keys = ['key' + str(i) for i in range(2000)]
+        ring = HashRing()
+        for shard in range(3):
+            ring.add(shard)
+        before = {key: ring.lookup(key) for key in keys}
+        self.assertEqual(set(before.values()), {0, 1, 2})
+
+        ring.add(3)
+        after = {key: ring.lookup(key) for key in keys}
+        moved = [key for key in keys if after[key] != before[key]]
+        self.assertTrue(moved)
+        self.assertTrue(all(after[key] == 3 for key in moved))
+        self.assertLess(len(moved), len(keys) / 2)
+
+        ring.remove(3)
+        self.assertEqual({key: ring.lookup(key) for key in keys}, before)
+
+
+class TestPartitioned(unittest.TestCase):
+    def test_add_and_remove_shard(self) -> None:
+        keys = ['key' + str(i) for i in range(1000)]
+        expected = {key: i for i, key in enumerate(keys)}
+        with PartitionedHashMap(shards=2) as hash_map:
+            hash_map.put_many(keys, list(range(len(keys))))
+            shard = hash_map.add_shard()
+            self.assertEqual(len(hash_map.get_shards()), 3)
+            self.assertEqual(hash_map.get_size(), len(keys))
+            self.assertEqual(pairs(hash_map), sorted(expected.items()))
+
+            hash_map.remove_shard(shard)
+            hash_map.remove('key0')
+            del expected['key0']
+            self.assertEqual(hash_map.get_size(), len(expected))
+            self.assertEqual(pairs(hash_map), sorted(expected.items()))
+            self.assertEqual(hash_map.get_many(keys), [expected.get(key) for key in keys])
+
+    def test_remove_shard_errors(self) -> None:
+        with PartitionedHashMap(shards=1) as hash_map:
+            with self.assertRaises(KeyError):
+                hash_map.remove_shard(99)
+            with self.assertRaises(ValueError):
+                hash_map.remove_shard(hash_map.get_shards()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
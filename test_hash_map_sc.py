@@ -0,0 +1,160 @@
+# Description: Tests for the separate chaining HashMap: buckets turn into SortedChains
+#              above the treeify threshold and back into lists and single nodes as
+#              they shrink, and chains of unorderable keys still work. Array chains
+#              keep their entries in flat arrays, far smaller than linked nodes. The
+#              maintained statistics match a direct count of the buckets.
+
+import copy
+import unittest
+from functools import partial
+from itertools import permutations
+
+import memory_benchmark
+from a6_include import LinkedList, SLNode, hash_function_1, hash_function_2, hash_function_builtin
+from hash_map_sc import HashMap, SortedChain, _TREEIFY_THRESHOLD, _UNTREEIFY_THRESHOLD
+
+
+def constant_hash(key: object) -> int:
+    """
+    Returns the same hash for every key, so all keys share one bucket.
+    """
+    return 7
+
+
+class TestTreeify(unittest.TestCase):
+    def test_thresholds(self) -> None:
+        # hash_function_1 gives every permutation of 'abcd' the same hash
+        keys = [''.join(letters) for letters in permutations('abcd')]
+        hash_map = HashMap(101, hash_function_1)
+        idx = hash_function_1(keys[0]) % hash_map.get_capacity()
+
+        def bucket():
+            return hash_map._buckets[idx]
+
+        hash_map.put(keys[0], 0)
+        self.assertIsInstance(bucket(), SLNode)
+        for i in range(1, _TREEIFY_THRESHOLD):
+            hash_map.put(keys[i], i)
+        self.assertIsInstance(bucket(), LinkedList)
+        hash_map.put(keys[_TREEIFY_THRESHOLD], _TREEIFY_THRESHOLD)
+        self.assertIsInstance(bucket(), SortedChain)
+        for i in range(_TREEIFY_THRESHOLD + 1, len(keys)):
+            hash_map.put(keys[i], i)
+        self.assertEqual(bucket().length(), len(keys))
+        self.assertEqual([hash_map.get(key) for key in keys], list(range(len(keys))))
+
+        for i in range(len(keys) - 1, _UNTREEIFY_THRESHOLD, -1):
+            hash_map.remove(keys[i])
+            self.assertIsInstance(bucket(), SortedChain)
+        hash_map.remove(keys[_UNTREEIFY_THRESHOLD])
+        self.assertIsInstance(bucket(), LinkedList)
+        for i in range(_UNTREEIFY_THRESHOLD - 1, 0, -1):
+            hash_map.remove(keys[i])
+        self.assertIsInstance(bucket(), SLNode)
+        self.assertEqual((hash_map.get(keys[0]), hash_map.get(keys[1]), hash_map.get_size()),
+                         (0, None, 1))
+
+    def test_unorderable_keys(self) -> None:
+        keys = ['a', 1, None, ('t',), 2.5, b'b', 'z', 3, frozenset(), 'c', 4]
+        hash_map = HashMap(11, constant_hash)
+        for i, key in enumerate(keys):
+            hash_map.put(key, i)
+        self.assertIsInstance(hash_map._buckets[7], SortedChain)
+        self.assertEqual([hash_map.get(key) for key in keys], list(range(len(keys))))
+        self.assertIsNone(hash_map.get('missing'))
+
+        for key in keys[::2]:
+            hash_map.remove(key)
+        self.assertEqual([hash_map.get(key) for key in keys],
+                         [None if i % 2 == 0 else i for i in range(len(keys))])
+
+    def test_removed_node_unlinked(self) -> None:
+        keys = [''.join(letters) for letters in permutations('abcd')][:_TREEIFY_THRESHOLD + 1]
+        hash_map = HashMap(101, hash_function_1)
+        for i, key in enumerate(keys):
+            hash_map.put(key, i)
+        chain = hash_map._buckets[hash_function_1(keys[0]) % hash_map.get_capacity()]
+        self.assertIsInstance(chain, SortedChain)
+        self.assertTrue(all(node.next is None for node in chain))
+
+
+def counted_stats(hash_map) -> dict:
+    """
+    Returns the empty buckets and longest chain of a map, counted bucket by bucket
+    on a copy whose resize in progress, if any, has been finished.
+    """
+    hash_map = copy.deepcopy(hash_map)
+    hash_map._finish_rehash()
+    lengths = []
+    for i in range(hash_map._buckets.length()):
+        bucket = hash_map._buckets[i]
+        lengths.append(0 if bucket is None else 1 if isinstance(bucket, SLNode) else len(list(bucket)))
+    return {'empty_buckets': lengths.count(0), 'longest_chain': max(lengths)}
+
+
+class TestStats(unittest.TestCase):
+    def test_against_count(self) -> None:
+        for name, factory in (('linked', HashMap), ('array', partial(HashMap, array_chains=True))):
+            with self.subTest(buckets=name):
+                hash_map = factory(11, hash_function_2, incremental=True)
+                rehashed = False
+                for i in range(300):
+                    hash_map.put('k' + str(i), i)
+                    if i % 3 == 0:
+                        hash_map.remove('k' + str(i // 2))
+                    stats = hash_map.stats()
+                    rehashed |= stats['rehashing']
+                    expected = counted_stats(hash_map)
+                    self.assertEqual(hash_map.empty_buckets(), expected['empty_buckets'])
+                    self.assertEqual(stats['empty_buckets'], expected['empty_buckets'])
+                    self.assertLessEqual(stats['empty_buckets'], hash_map.get_capacity())
+                    if not stats['rehashing']:
+                        self.assertEqual(stats['longest_chain'], expected['longest_chain'])
+                self.assertTrue(rehashed)
+
+    def test_resize_example(self) -> None:
+        hash_map = HashMap(11, hash_function_2, incremental=True)
+        for i in range(12):
+            hash_map.put('k' + str(i), i)
+        self.assertTrue(hash_map.stats()['rehashing'])
+        self.assertEqual(hash_map.get_capacity(), 23)
+        self.assertEqual(hash_map.empty_buckets(), counted_stats(hash_map)['empty_buckets'])
+
+
+class TestArrayChains(unittest.TestCase):
+    def test_memory(self) -> None:
+        linked = memory_benchmark.measure(HashMap, hash_function_builtin, 20000)
+        arrays = memory_benchmark.measure(memory_benchmark.MAPS['sc-array'],
+                                          hash_function_builtin, 20000)
+        self.assertLess(arrays['bytes_per_entry'], linked['bytes_per_entry'] / 2)
+
+    def test_free_entries_reused(self) -> None:
+        hash_map = HashMap(11, hash_function_builtin, array_chains=True)
+        for i in range(100):
+            hash_map.put(i, i)
+        for i in range(0, 100, 2):
+            hash_map.remove(i)
+        for i in range(100, 150):
+            hash_map.put(i, i)
+        entries = hash_map._buckets.entries
+        self.assertEqual(len(entries.keys), 100)
+        self.assertEqual(sorted(hash_map.keys()), list(range(1, 100, 2)) + list(range(100, 150)))
+
+    def test_negative_hashes(self) -> None:
+        # hash() of a negative int is negative, so it can't be stored unboxed
+        hash_map = HashMap(11, hash, array_chains=True)
+        for i in range(-50, 50):
+            hash_map.put(i, i * 2)
+        self.assertIsInstance(hash_map._buckets.entries.hashes, list)
+        self.assertEqual([hash_map.get(i) for i in range(-50, 50)], [i * 2 for i in range(-50, 50)])
+
+    def test_str(self) -> None:
+        hash_map = HashMap(3, hash_function_builtin, array_chains=True)
+        hash_map.put('a', 1)
+        lines = str(hash_map).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("[('a', 1)]", str(hash_map))
+
+
+if __name__ == '__main__':
+    unittest.main()
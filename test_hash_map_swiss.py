@@ -0,0 +1,58 @@
+# Description: Tests for the SwissTable-style HashMap: the batched get_many() must give
+#              the same answers as get() for hits, misses and collisions, and its
+#              vectorized finalizer must match mix_hash.
+
+import random
+import unittest
+from itertools import permutations
+
+import numpy as np
+
+from a6_include import mix_hash, mix_hash_array, hash_function_1, hash_function_builtin
+from hash_map_swiss import HashMap
+
+
+class TestGetMany(unittest.TestCase):
+    def test_matches_get(self) -> None:
+        rnd = random.Random(6)
+        for function in (hash_function_1, hash_function_builtin):
+            with self.subTest(function=function.__name__):
+                hash_map = HashMap(11, function)
+                keys = [''.join(rnd.choices('abcd', k=6)) for _ in range(2000)]
+                for i, key in enumerate(keys):
+                    hash_map.put(key, i)
+                for key in keys[::3]:
+                    hash_map.remove(key)  # leaves deleted control bytes to probe past
+
+                queries = keys + ['missing' + str(i) for i in range(500)]
+                rnd.shuffle(queries)
+                self.assertEqual(hash_map.get_many(queries),
+                                 [hash_map.get(key) for key in queries])
+
+    def test_full_groups(self) -> None:
+        # hash_function_1 gives every permutation of the same letters one hash, so
+        # these 120 keys fill their home group and spill over several more
+        hash_map = HashMap(11, hash_function_1)
+        keys = [''.join(letters) for letters in permutations('abcde')]
+        for i, key in enumerate(keys):
+            hash_map.put(key, i)
+        self.assertEqual(hash_map.get_many(iter(keys + ['abcdd'])),
+                         list(range(len(keys))) + [None])
+
+    def test_empty(self) -> None:
+        self.assertEqual(HashMap(11, hash_function_1).get_many([]), [])
+
+
+class TestMixHashArray(unittest.TestCase):
+    def test_matches_mix_hash(self) -> None:
+        codes = [0, 1, 42, (1 << 64) - 1, 0x123456789ABCDEF0]
+        seeds = [0, 7, (1 << 63) + 5]
+        array = np.array(codes, dtype=np.uint64)
+        self.assertEqual(mix_hash_array(array).tolist(), [mix_hash(code) for code in codes])
+        rows = mix_hash_array(array[None, :], np.array(seeds, dtype=np.uint64)[:, None])
+        self.assertEqual(rows.tolist(),
+                         [[mix_hash(code, seed) for code in codes] for seed in seeds])
+
+
+if __name__ == '__main__':
+    unittest.main()
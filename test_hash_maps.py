@@ -0,0 +1,233 @@
+# Description: Tests shared by every hash map. Each map and mode, including the
+#              incremental resize modes, is driven with the same random operations as
+#              a dict and must agree with it after each step, one key at a time and
+#              in batches, and through their views and iterators.
+
+import random
+import unittest
+from functools import partial
+
+import numpy as np
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_1, hash_function_2
+from hash_map_concurrent import ConcurrentHashMap
+from hash_map_cuckoo import HashMap as CuckooHashMap
+from hash_map_swiss import HashMap as SwissHashMap
+
+MAPS = {
+    'sc': hash_map_sc.HashMap,
+    'sc incremental': partial(hash_map_sc.HashMap, incremental=True),
+    'sc power_of_two': partial(hash_map_sc.HashMap, power_of_two=True),
+    'sc array_chains': partial(hash_map_sc.HashMap, array_chains=True),
+    'sc array_chains incremental': partial(hash_map_sc.HashMap, array_chains=True,
+                                           incremental=True),
+    'oa': hash_map_oa.HashMap,
+    'oa incremental': partial(hash_map_oa.HashMap, incremental=True),
+    'oa power_of_two': partial(hash_map_oa.HashMap, power_of_two=True),
+    'flat': hash_map_oa.FlatHashMap,
+    'robin hood': hash_map_oa.RobinHoodHashMap,
+    'swiss': SwissHashMap,
+    'cuckoo': CuckooHashMap,
+    'concurrent': ConcurrentHashMap,
+}
+
+# maps with keys(), values() and items() views, and with setdefault(),
+# update_with() and increment()
+VIEW_MAPS = {name: MAPS[name] for name in MAPS if name not in ('swiss', 'cuckoo')}
+
+# maps that iterate over their entries
+ITERABLE_MAPS = {name: MAPS[name] for name in MAPS if name != 'concurrent'}
+
+# maps with put_many, get_many and remove_many
+BATCH_MAPS = {name: MAPS[name] for name in
+              ('sc', 'sc incremental', 'sc power_of_two', 'sc array_chains',
+               'sc array_chains incremental',
+               'oa', 'oa incremental', 'oa power_of_two', 'flat', 'robin hood')}
+
+
+def pairs(hash_map) -> list:
+    """
+    Returns the sorted key/value pairs stored in the given map.
+    """
+    keys_and_values = hash_map.get_keys_and_values()
+    return sorted(keys_and_values[i] for i in range(keys_and_values.length()))
+
+
+class TestAgainstDict(unittest.TestCase):
+    def check(self, factory, function, seed: int = 1, steps: int = 3000) -> None:
+        """
+        Runs random puts, removes, lookups and resizes on a new map and a dict.
+        """
+        rnd = random.Random(seed)
+        hash_map = factory(11, function)
+        expected = {}
+        for step in range(steps):
+            key = 'key' + str(rnd.randrange(300))
+            op = rnd.random()
+            if op < 0.5:
+                hash_map.put(key, step)
+                expected[key] = step
+            elif op < 0.75:
+                hash_map.remove(key)
+                expected.pop(key, None)
+            elif op < 0.99:
+                self.assertEqual(hash_map.get(key), expected.get(key))
+                self.assertEqual(hash_map.contains_key(key), key in expected)
+            else:
+                hash_map.resize_table(rnd.randrange(len(expected) + 1, 600))
+            self.assertEqual(hash_map.get_size(), len(expected))
+
+        self.assertEqual(pairs(hash_map), sorted(expected.items()))
+        hash_map.clear()
+        self.assertEqual(hash_map.get_size(), 0)
+        self.assertEqual(pairs(hash_map), [])
+
+    def test_maps(self) -> None:
+        for name, factory in MAPS.items():
+            for function in (hash_function_1, hash_function_2):
+                with self.subTest(map=name, function=function.__name__):
+                    self.check(factory, function)
+
+
+class TestUpsert(unittest.TestCase):
+    def test_against_dict(self) -> None:
+        for name, factory in VIEW_MAPS.items():
+            with self.subTest(map=name):
+                rnd = random.Random(19)
+                hash_map = factory(11, hash_function_1)
+                expected = {}
+                for step in range(2000):
+                    key = 'key' + str(rnd.randrange(200))
+                    op = rnd.random()
+                    if op < 0.4:
+                        self.assertEqual(hash_map.increment(key, 2), expected.get(key, 0) + 2)
+                        expected[key] = expected.get(key, 0) + 2
+                    elif op < 0.6:
+                        self.assertEqual(hash_map.setdefault(key, step), expected.setdefault(key, step))
+                    elif op < 0.8:
+                        value = hash_map.update_with(key, lambda value: value * 3, 1)
+                        expected[key] = expected.get(key, 1) * 3
+                        self.assertEqual(value, expected[key])
+                    else:
+                        hash_map.remove(key)
+                        expected.pop(key, None)
+                    self.assertEqual(hash_map.get_size(), len(expected))
+                self.assertEqual(pairs(hash_map), sorted(expected.items()))
+
+    def test_calls_and_none_values(self) -> None:
+        for name, factory in VIEW_MAPS.items():
+            with self.subTest(map=name):
+                hash_map = factory(11, hash_function_1)
+                calls = []
+                hash_map.update_with('a', lambda value: calls.append(value) or 5, 0)
+                hash_map.update_with('a', lambda value: calls.append(value) or 6, 0)
+                self.assertEqual(calls, [0, 5])
+                self.assertEqual(hash_map.get('a'), 6)
+
+                # a key stored with the value None is in the map and keeps it
+                self.assertIsNone(hash_map.setdefault('b'))
+                self.assertTrue(hash_map.contains_key('b'))
+                self.assertIsNone(hash_map.setdefault('b', 1))
+                self.assertEqual(hash_map.get_size(), 2)
+
+
+class TestViews(unittest.TestCase):
+    def test_views(self) -> None:
+        for name, factory in VIEW_MAPS.items():
+            with self.subTest(map=name):
+                hash_map = factory(11, hash_function_2)
+                keys, values, items = hash_map.keys(), hash_map.values(), hash_map.items()
+                expected = {}
+                for i in range(60):
+                    hash_map.put('key' + str(i), i * i)
+                    expected['key' + str(i)] = i * i
+                hash_map.remove('key7')
+                del expected['key7']
+
+                # the views were made before the puts and show the current contents
+                self.assertEqual(len(keys), len(expected))
+                self.assertEqual(sorted(keys), sorted(expected))
+                self.assertEqual(sorted(values), sorted(expected.values()))
+                self.assertEqual(sorted(items), sorted(expected.items()))
+                self.assertIn('key8', keys)
+                self.assertNotIn('key7', keys)
+                self.assertIn(64, values)
+                self.assertIn(('key8', 64), items)
+                self.assertNotIn(('key8', 65), items)
+
+    def test_reentrant_iteration(self) -> None:
+        for name, factory in VIEW_MAPS.items():
+            with self.subTest(map=name):
+                hash_map = factory(11, hash_function_2)
+                for i in range(30):
+                    hash_map.put('key' + str(i), i)
+                keys = hash_map.keys()
+                pairs_seen = [(a, b) for a in keys for b in keys]
+                self.assertEqual(len(pairs_seen), 30 * 30)
+                first, second = iter(keys), iter(keys)
+                next(first)
+                self.assertEqual(len(list(second)), 30)
+                self.assertEqual(len(list(first)), 29)
+
+    def test_map_iteration(self) -> None:
+        for name, factory in ITERABLE_MAPS.items():
+            with self.subTest(map=name):
+                hash_map = factory(11, hash_function_2)
+                for i in range(30):
+                    hash_map.put('key' + str(i), i)
+                self.assertEqual(sorted((entry.key, entry.value) for entry in hash_map),
+                                 pairs(hash_map))
+                self.assertEqual(sum(1 for _ in hash_map for _ in hash_map), 30 * 30)
+
+
+class TestBatch(unittest.TestCase):
+    def check(self, factory) -> None:
+        """
+        Runs batches of puts, lookups and removes on a new map and a dict.
+        """
+        rnd = random.Random(10)
+        hash_map = factory(11, hash_function_2)
+        expected = {}
+        for batch in range(20):
+            keys = ['key' + str(rnd.randrange(500)) for _ in range(rnd.randrange(1, 200))]
+            values = [batch * 1000 + i for i in range(len(keys))]
+            hash_map.put_many(keys, values)
+            expected.update(zip(keys, values))  # the last value of a repeated key wins
+
+            removed = rnd.sample(keys, len(keys) // 3)
+            hash_map.remove_many(iter(removed))
+            for key in removed:
+                expected.pop(key, None)
+
+            queries = ['key' + str(i) for i in range(500)]
+            self.assertEqual(hash_map.get_many(queries), [expected.get(key) for key in queries])
+            self.assertEqual(hash_map.get_size(), len(expected))
+        self.assertEqual(pairs(hash_map), sorted(expected.items()))
+
+    def test_maps(self) -> None:
+        for name, factory in BATCH_MAPS.items():
+            with self.subTest(map=name):
+                self.check(factory)
+
+    def test_numpy_input(self) -> None:
+        for name, factory in BATCH_MAPS.items():
+            with self.subTest(map=name):
+                hash_map = factory(11, hash)
+                hash_map.put_many(np.arange(100), np.arange(100) * 2)
+                self.assertEqual(hash_map.get_many(np.arange(0, 200, 50)), [0, 100, None, None])
+                hash_map.remove_many(np.arange(50))
+                self.assertEqual(hash_map.get_size(), 50)
+
+    def test_length_mismatch(self) -> None:
+        for name, factory in BATCH_MAPS.items():
+            with self.subTest(map=name):
+                hash_map = factory(11, hash_function_2)
+                with self.assertRaises(ValueError):
+                    hash_map.put_many(['a', 'b'], [1])
+                self.assertEqual(hash_map.get_size(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Description: Tests for the streaming mode finders: ExactCounter and stream_mode agree
+#              with find_mode, SpaceSaving and CountMinSketch stay within their error
+#              bounds on a skewed stream and report its heaviest items, and every
+#              counter works with format_top.
+
+import random
+import unittest
+from collections import Counter
+
+from a6_include import DynamicArray
+from hash_map_sc import find_mode
+from heavy_hitters import (CountMinSketch, ExactCounter, SpaceSaving, chunks, format_top,
+                           stream_mode)
+
+
+def skewed_stream(length: int, seed: int = 5) -> list:
+    """
+    Returns a Pareto-distributed stream of numeric strings, where '1' is the mode
+    and a few items make up most of the stream.
+    """
+    rnd = random.Random(seed)
+    return [str(int(rnd.paretovariate(1.1))) for _ in range(length)]
+
+
+class TestExactCounter(unittest.TestCase):
+    def test_matches_find_mode(self) -> None:
+        stream = skewed_stream(20000)
+        modes, frequency = stream_mode(iter(stream), chunk_size=1000)
+        expected_modes, expected_frequency = find_mode(DynamicArray(stream))
+        self.assertEqual((sorted(modes), frequency), (sorted(expected_modes), expected_frequency))
+
+    def test_ties_and_top_k(self) -> None:
+        counter = ExactCounter()
+        for chunk in chunks('abcabcab', 3):
+            counter.update(chunk)
+        modes, frequency = counter.modes()
+        self.assertEqual((sorted(modes), frequency), (['a', 'b'], 3))
+        self.assertEqual([count for _, count, _ in counter.top_k(3)], [3, 3, 2])
+        self.assertEqual((counter.estimate('c'), counter.estimate('z'), counter.get_total()),
+                         (2, 0, 8))
+
+    def test_empty(self) -> None:
+        modes, frequency = stream_mode([])
+        self.assertEqual((modes.length(), frequency), (0, 0))
+
+
+class TestBoundedCounters(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stream = skewed_stream(50000)
+        self.true = Counter(self.stream)
+
+    def test_space_saving(self) -> None:
+        counter = SpaceSaving(100)
+        modes, frequency = stream_mode(iter(self.stream), counter, chunk_size=5000)
+        self.assertEqual((list(modes), frequency), (['1'], self.true['1']))
+        self.assertLessEqual(counter.error_bound(), len(self.stream) / 100)
+        for item, count, error in counter.top_k(20):
+            self.assertLessEqual(count - error, self.true[item])
+            self.assertLessEqual(self.true[item], count)
+        for item, count in self.true.items():
+            if count > len(self.stream) / 100:
+                self.assertGreaterEqual(counter.estimate(item), count)
+
+    def test_count_min_sketch(self) -> None:
+        counter = CountMinSketch(0.001, 0.01, candidates=20)
+        modes, frequency = stream_mode(iter(self.stream), counter, chunk_size=7000)
+        self.assertEqual(list(modes), ['1'])
+        bound = counter.error_bound()
+        self.assertEqual(bound, 0.001 * len(self.stream))
+        for item, count in self.true.items():
+            self.assertLessEqual(count, counter.estimate(item))
+            self.assertLessEqual(counter.estimate(item), count + bound)
+        top = [item for item, _, _ in counter.top_k(5)]
+        self.assertEqual(top, [item for item, _ in self.true.most_common(5)])
+
+    def test_candidates_bounded(self) -> None:
+        counter = CountMinSketch(candidates=3)
+        counter.update(['x' + str(i) for i in range(100)] + ['a'] * 10)
+        self.assertEqual(counter._candidates.counts.get_size(), 3)
+        self.assertEqual(counter.modes()[0][0], 'a')
+
+    def test_format_top(self) -> None:
+        for counter in (ExactCounter(), SpaceSaving(10), CountMinSketch(0.01)):
+            with self.subTest(counter=type(counter).__name__):
+                counter.update(['a', 'b', 'a'])
+                lines = format_top(counter, 2).splitlines()
+                self.assertEqual(len(lines), 4)
+                self.assertTrue(lines[1].endswith('  a'))
+                self.assertTrue(lines[3].startswith('3 items'))
+
+
+if __name__ == '__main__':
+    unittest.main()
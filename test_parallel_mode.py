@@ -0,0 +1,58 @@
+# Description: Tests for the parallel find_mode: counting chunks of an array or byte
+#              ranges of a file in worker processes gives find_mode's answer, however
+#              the chunk and range boundaries fall.
+
+import os
+import random
+import tempfile
+import unittest
+
+from a6_include import DynamicArray, hash_function_2
+from hash_map_sc import find_mode
+from parallel_mode import find_mode_file, find_mode_parallel
+
+
+def random_items(length: int, seed: int = 21) -> list:
+    """
+    Returns a list of short random strings, with many repeats and some ties.
+    """
+    rnd = random.Random(seed)
+    return [''.join(rnd.choices('abc', k=rnd.randint(1, 4))) for _ in range(length)]
+
+
+class TestFindModeParallel(unittest.TestCase):
+    def test_matches_find_mode(self) -> None:
+        items = random_items(5000)
+        modes, frequency = find_mode_parallel(DynamicArray(items), processes=2, chunk_size=700)
+        expected_modes, expected_frequency = find_mode(DynamicArray(items))
+        self.assertEqual((sorted(modes), frequency), (sorted(expected_modes), expected_frequency))
+
+    def test_ties(self) -> None:
+        modes, frequency = find_mode_parallel(['x', 'y', 'x', 'y', 'z'], processes=2,
+                                              chunk_size=2, function=hash_function_2)
+        self.assertEqual((sorted(modes), frequency), (['x', 'y'], 2))
+
+    def test_empty(self) -> None:
+        modes, frequency = find_mode_parallel([], processes=1)
+        self.assertEqual((modes.length(), frequency), (0, 0))
+
+
+class TestFindModeFile(unittest.TestCase):
+    def test_ranges_split_lines(self) -> None:
+        items = random_items(3000) + ['ünïcode'] * 700
+        random.Random(4).shuffle(items)
+        expected_modes, expected_frequency = find_mode(DynamicArray(items))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'items.txt')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('\n'.join(items))  # no newline after the last line
+            # ranges of 37 bytes start and end in the middle of lines and characters
+            for chunk_bytes in (37, 1 << 20):
+                with self.subTest(chunk_bytes=chunk_bytes):
+                    modes, frequency = find_mode_file(path, processes=2, chunk_bytes=chunk_bytes)
+                    self.assertEqual((sorted(modes), frequency),
+                                     (sorted(expected_modes), expected_frequency))
+
+
+if __name__ == '__main__':
+    unittest.main()